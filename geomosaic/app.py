@@ -1,15 +1,15 @@
 from __future__ import annotations
 
+import multiprocessing
 import queue
 import threading
 import time
 from pathlib import Path
 
 import tkinter as tk
-from tkinter import filedialog, messagebox
-from tkinter.scrolledtext import ScrolledText
 
 from geomosaic.backend import (
+    TILE_FORMATS,
     RasterPreviewInfo,
     environment_hint,
     generate_xyz_tiles,
@@ -18,6 +18,9 @@ from geomosaic.backend import (
 )
 from geomosaic.html import PreviewConfig, build_leaflet_preview_html
 
+# Lines kept in the log box; older lines are dropped.
+_MAX_LOG_LINES = 5000
+
 
 class App(tk.Tk):
     def __init__(self) -> None:
@@ -28,6 +31,8 @@ class App(tk.Tk):
         self._log_queue: queue.Queue[str] = queue.Queue()
         self._worker: threading.Thread | None = None
         self._last_preview: RasterPreviewInfo | None = None
+        # (epoch second, "HH:MM:SS ") of the last formatted log timestamp
+        self._ts_cache: tuple[int, str] = (0, "")
 
         self._build_ui()
         self._pump_logs()
@@ -35,6 +40,9 @@ class App(tk.Tk):
         self._log(environment_hint())
 
     def _build_ui(self) -> None:
+        # tkinter 子模块按需导入，缩短启动到首帧的时间
+        from tkinter.scrolledtext import ScrolledText
+
         pad = {"padx": 10, "pady": 6}
 
         frm = tk.Frame(self)
@@ -64,12 +72,17 @@ class App(tk.Tk):
         self.maxz_var = tk.IntVar(value=18)
         tk.Spinbox(zfrm, from_=0, to=30, width=6, textvariable=self.maxz_var).grid(row=0, column=3, sticky="w")
 
+        # PNG 保留透明；WEBP/JPEG 编码更快，适合不透明的正射影像（JPEG 不含透明通道）
+        tk.Label(zfrm, text="瓦片格式：").grid(row=0, column=4, sticky="w", padx=(14, 0))
+        self.fmt_var = tk.StringVar(value="PNG")
+        tk.OptionMenu(zfrm, self.fmt_var, *TILE_FORMATS).grid(row=0, column=5, sticky="w")
+
         self.suggest_lbl = tk.Label(zfrm, text="建议 Max Zoom：-", fg="#555")
-        self.suggest_lbl.grid(row=0, column=4, sticky="w", padx=(14, 0))
+        self.suggest_lbl.grid(row=0, column=6, sticky="w", padx=(14, 0))
 
         self.keep_tmp_var = tk.BooleanVar(value=False)
-        tk.Checkbutton(zfrm, text="保留中间文件(warped_3857.tif)", variable=self.keep_tmp_var).grid(
-            row=1, column=0, columnspan=5, sticky="w", pady=(4, 0)
+        tk.Checkbutton(zfrm, text="保留中间文件(warped_3857.tif/.vrt)", variable=self.keep_tmp_var).grid(
+            row=1, column=0, columnspan=7, sticky="w", pady=(4, 0)
         )
 
         # Buttons
@@ -91,6 +104,8 @@ class App(tk.Tk):
         frm.columnconfigure(1, weight=1)
 
     def _pick_input(self) -> None:
+        from tkinter import filedialog
+
         p = filedialog.askopenfilename(
             title="选择 GeoTIFF",
             filetypes=[
@@ -102,11 +117,15 @@ class App(tk.Tk):
             self.in_var.set(p)
 
     def _pick_output(self) -> None:
+        from tkinter import filedialog
+
         p = filedialog.askdirectory(title="选择输出目录")
         if p:
             self.out_var.set(p)
 
     def _start(self) -> None:
+        from tkinter import messagebox
+
         if self._worker and self._worker.is_alive():
             messagebox.showinfo("提示", "正在处理，请稍候...")
             return
@@ -115,6 +134,7 @@ class App(tk.Tk):
         out_dir = Path(self.out_var.get().strip())
         minz = int(self.minz_var.get())
         maxz = int(self.maxz_var.get())
+        tile_format = self.fmt_var.get()
 
         if not src.exists():
             messagebox.showerror("错误", "请选择有效的输入 GeoTIFF 文件")
@@ -134,15 +154,16 @@ class App(tk.Tk):
         self._log(f"输入：{src}")
         self._log(f"输出：{out_dir}")
         self._log(f"Zoom：{minz}-{maxz}")
+        self._log(f"瓦片格式：{tile_format}")
 
         self._worker = threading.Thread(
             target=self._run_pipeline,
-            args=(src, out_dir, minz, maxz),
+            args=(src, out_dir, minz, maxz, tile_format),
             daemon=True,
         )
         self._worker.start()
 
-    def _run_pipeline(self, src: Path, out_dir: Path, minz: int, maxz: int) -> None:
+    def _run_pipeline(self, src: Path, out_dir: Path, minz: int, maxz: int, tile_format: str) -> None:
         try:
             info = warp_to_web_mercator(src, out_dir, self._log)
             self._last_preview = info
@@ -151,10 +172,10 @@ class App(tk.Tk):
             if info.suggested_max_zoom is not None:
                 self._log_queue.put(f"__SUGGEST__{info.suggested_max_zoom}")
 
-            generate_xyz_tiles(info.warped_path, out_dir, minz, maxz, self._log)
+            generate_xyz_tiles(info.warped_path, out_dir, minz, maxz, self._log, tile_format=tile_format)
 
             self._log("生成 Leaflet 预览页面 index.html...")
-            tiles_tpl, sample_tile = guess_xyz_tiles_url_template(out_dir)
+            tiles_tpl, sample_tile = guess_xyz_tiles_url_template(out_dir, TILE_FORMATS[tile_format])
             self._log(f"预览瓦片路径模板：{tiles_tpl}")
             if sample_tile is not None:
                 try:
@@ -196,17 +217,27 @@ class App(tk.Tk):
             self._log_queue.put(f"__ERR__{e}")
 
     def _pump_logs(self) -> None:
+        # 普通日志先攒起来，每个周期只插入/滚动一次，避免逐行重绘
+        pending: list[str] = []
         try:
             while True:
                 msg = self._log_queue.get_nowait()
 
+                if msg.startswith("__"):
+                    self._append_log(pending)
+                    pending = []
+
                 if msg.startswith("__DONE__"):
+                    from tkinter import messagebox
+
                     self.run_btn.configure(state=tk.NORMAL)
                     self.open_btn.configure(state=tk.NORMAL)
                     messagebox.showinfo("完成", "切片完成！已生成 index.html，可打开输出目录预览。")
                     continue
 
                 if msg.startswith("__ERR__"):
+                    from tkinter import messagebox
+
                     self.run_btn.configure(state=tk.NORMAL)
                     self.open_btn.configure(state=tk.NORMAL)
                     messagebox.showerror("失败", msg[len("__ERR__") :])
@@ -217,18 +248,31 @@ class App(tk.Tk):
                     self.suggest_lbl.configure(text=f"建议 Max Zoom：{val}", fg="#2a6")
                     continue
 
-                self._append_log(msg)
+                pending.append(msg)
         except queue.Empty:
             pass
 
+        self._append_log(pending)
         self.after(120, self._pump_logs)
 
-    def _append_log(self, s: str) -> None:
+    def _append_log(self, lines: list[str]) -> None:
+        if not lines:
+            return
+        ts = self._timestamp()
+        text = "".join(ts + s + "\n" for s in lines)
         self.logbox.configure(state=tk.NORMAL)
-        self.logbox.insert(tk.END, time.strftime("%H:%M:%S ") + s + "\n")
+        self.logbox.insert(tk.END, text)
+        # 只保留最近的日志，防止长时间切片后文本控件越来越慢
+        self.logbox.delete("1.0", f"end-{_MAX_LOG_LINES}l")
         self.logbox.see(tk.END)
         self.logbox.configure(state=tk.DISABLED)
 
+    def _timestamp(self) -> str:
+        now_s = int(time.time())
+        if now_s != self._ts_cache[0]:
+            self._ts_cache = (now_s, time.strftime("%H:%M:%S ", time.localtime(now_s)))
+        return self._ts_cache[1]
+
     def _log(self, s: str) -> None:
         self._log_queue.put(s)
 
@@ -241,10 +285,14 @@ class App(tk.Tk):
 
             os.startfile(p)  # type: ignore[attr-defined]
         except Exception as e:
+            from tkinter import messagebox
+
             messagebox.showerror("错误", f"无法打开输出目录：{e}")
 
 
 def main() -> int:
+    # gdal2tiles 使用多进程切片；打包后的 exe 需要 freeze_support 才能正确启动子进程。
+    multiprocessing.freeze_support()
     app = App()
     app.mainloop()
     return 0
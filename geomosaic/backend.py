@@ -5,7 +5,6 @@ import os
 import contextlib
 import io
 import logging
-import subprocess
 import sys
 from dataclasses import dataclass
 from pathlib import Path
@@ -37,38 +36,58 @@ def _preconfigure_dll_search_path_for_frozen() -> None:
         base,
         base / "osgeo",
     ]
+    existing_dirs = tuple(d for d in dll_dirs if d.exists())
 
     # Prefer robust DLL search path on py>=3.8
-    for d in dll_dirs:
+    for d in existing_dirs:
         try:
-            if d.exists():
-                os.add_dll_directory(str(d))  # type: ignore[attr-defined]
+            os.add_dll_directory(str(d))  # type: ignore[attr-defined]
         except Exception:
             pass
 
     # Also prepend PATH for libraries using legacy search.
     existing = os.environ.get("PATH", "")
-    prefix = os.pathsep.join(str(d) for d in dll_dirs if d.exists())
-    if prefix and (prefix not in existing):
-        os.environ["PATH"] = prefix + os.pathsep + existing
+    existing_parts = set(map(os.path.normcase, existing.split(os.pathsep)))
+    missing = [str(d) for d in existing_dirs if os.path.normcase(str(d)) not in existing_parts]
+    if missing:
+        os.environ["PATH"] = os.pathsep.join(missing + [existing])
 
 
 # Must run BEFORE importing osgeo in frozen builds
 _preconfigure_dll_search_path_for_frozen()
 
-try:
-    from osgeo import gdal, osr  # type: ignore
-except Exception as e:  # pragma: no cover
-    gdal = None  # type: ignore
-    osr = None  # type: ignore
-    _OSGEO_IMPORT_ERROR = e
-else:
-    _OSGEO_IMPORT_ERROR = None
-    _GDAL_RUNTIME_CONFIGURED = False
+# GDAL (and the PROJ/CURL/SQLite DLLs it drags in) is imported lazily by
+# _lazy_load_gdal() so the GUI window can appear first.
+gdal = None  # type: ignore
+osr = None  # type: ignore
+_OSGEO_IMPORT_ERROR: Optional[Exception] = None
+_GDAL_IMPORT_ATTEMPTED = False
+_GDAL_RUNTIME_CONFIGURED = False
+
+
+def _lazy_load_gdal() -> None:
+    global gdal, osr, _OSGEO_IMPORT_ERROR, _GDAL_IMPORT_ATTEMPTED
+    if _GDAL_IMPORT_ATTEMPTED:
+        return
+    _GDAL_IMPORT_ATTEMPTED = True
+    try:
+        from osgeo import gdal as _gdal, osr as _osr  # type: ignore
+    except Exception as e:  # pragma: no cover
+        _OSGEO_IMPORT_ERROR = e
+    else:
+        gdal, osr = _gdal, _osr
 
 
 LogFn = Callable[[str], None]
 
+# gdal2tiles --tiledriver -> tile file extension. PNG keeps transparency;
+# WEBP/JPEG encode much faster for opaque imagery (JPEG drops alpha).
+TILE_FORMATS: dict[str, str] = {
+    "PNG": "png",
+    "WEBP": "webp",
+    "JPEG": "jpg",
+}
+
 
 @dataclass(frozen=True)
 class RasterPreviewInfo:
@@ -91,6 +110,7 @@ def environment_hint() -> str:
 
 
 def ensure_gdal_available() -> None:
+    _lazy_load_gdal()
     if _OSGEO_IMPORT_ERROR is not None:
         raise RuntimeError(
             "无法导入 GDAL Python 绑定 (osgeo)。\n"
@@ -124,13 +144,16 @@ def _configure_gdal_runtime() -> None:
         pass
 
     # Prefer official EPSG definition over GeoTIFF keys to avoid mismatch warnings.
+    # GDAL_NUM_THREADS lets compression/decompression use all cores.
     for k, v in [
         ("GTIFF_SRS_SOURCE", "EPSG"),
         ("OSR_USE_NON_DEPRECATED", "YES"),
+        ("GDAL_NUM_THREADS", "ALL_CPUS"),
     ]:
         os.environ.setdefault(k, v)
+        # Config options override env vars: forward the effective value so user-set ones win.
         try:
-            gdal.SetConfigOption(k, v)  # type: ignore[attr-defined]
+            gdal.SetConfigOption(k, os.environ[k])  # type: ignore[attr-defined]
         except Exception:
             pass
 
@@ -209,7 +232,11 @@ def _configure_gdal_runtime() -> None:
 
 def validate_geotiff(src_path: Path) -> None:
     ensure_gdal_available()
+    _open_validated_geotiff(src_path)
+
 
+def _open_validated_geotiff(src_path: Path):
+    """Open ``src_path`` and check it carries georeferencing; returns the dataset."""
     ds = gdal.OpenEx(str(src_path), gdal.OF_RASTER)  # type: ignore
     if ds is None:
         raise RuntimeError(f"无法读取影像：{src_path}")
@@ -221,6 +248,7 @@ def validate_geotiff(src_path: Path) -> None:
         raise RuntimeError("该 TIFF 缺少投影信息 (Projection)。请确认它是 GeoTIFF。")
     if gt is None:
         raise RuntimeError("该 TIFF 缺少地理参考 (GeoTransform)。请确认它是 GeoTIFF。")
+    return ds
 
 
 def warp_to_web_mercator(
@@ -234,13 +262,15 @@ def warp_to_web_mercator(
     # 避免把中间文件直接丢在输出根目录：统一放到缓存子目录
     cache_dir = out_dir / "_geomosaic_cache"
     cache_dir.mkdir(parents=True, exist_ok=True)
-    warped_path = cache_dir / "warped_3857.tif"
 
     log("读取与校验 GeoTIFF...")
-    validate_geotiff(src_path)
+    ds = _open_validated_geotiff(src_path)
 
-    ds = gdal.OpenEx(str(src_path), gdal.OF_RASTER)  # type: ignore
-    assert ds is not None
+    # 源影像已有概览（或本身很小）时只生成 WarpedVRT：gdal2tiles 按需重投影，
+    # 省去整幅中间 TIFF 的写入与回读。否则仍落盘为带概览的 GeoTIFF，
+    # 避免在用户的源文件旁边生成 .ovr。
+    use_vrt = _has_overviews(ds) or not _overview_levels(ds.RasterXSize, ds.RasterYSize)
+    warped_path = cache_dir / ("warped_3857.vrt" if use_vrt else "warped_3857.tif")
 
     log("智能重投影：确保 EPSG:3857 (Web Mercator)...")
 
@@ -255,20 +285,22 @@ def warp_to_web_mercator(
 
     warp_kwargs: dict = {
         "dstSRS": "EPSG:3857",
-        "format": "GTiff",
+        "format": "VRT" if use_vrt else "GTiff",
         "resampleAlg": gdal.GRA_Bilinear,  # type: ignore
         "multithread": True,
+        # Larger chunks -> fewer, bigger work units for the warper threads
+        "warpMemoryLimit": 512 * 1024 * 1024,
         # Key: create alpha so outside area becomes transparent
         "dstAlpha": True,
         # Ensure destination is initialized as nodata (transparent)
         "warpOptions": ["INIT_DEST=NO_DATA"],
-        "creationOptions": [
-            "TILED=YES",
-            "COMPRESS=DEFLATE",
-            "PREDICTOR=2",
-            "BIGTIFF=IF_SAFER",
-        ],
     }
+    if not use_vrt:
+        warp_kwargs["creationOptions"] = _intermediate_creation_options()
+        # NUM_THREADS makes the resampling itself multi-threaded, not just I/O.
+        # Not for the VRT: it is warped lazily inside every gdal2tiles worker
+        # process, which would oversubscribe the CPUs.
+        warp_kwargs["warpOptions"].append("NUM_THREADS=ALL_CPUS")
     if src_nodata is not None:
         warp_kwargs["srcNodata"] = src_nodata
         warp_kwargs["dstNodata"] = 0
@@ -277,18 +309,73 @@ def warp_to_web_mercator(
     res = gdal.Warp(str(warped_path), ds, options=opts)  # type: ignore
     if res is None:
         raise RuntimeError("GDAL Warp 失败：无法重投影到 EPSG:3857")
-    res = None
 
-    info = _compute_preview_info(warped_path)
+    # gdal2tiles 读取低于原始分辨率的区域时会自动使用概览，避免反复解码全分辨率像素。
+    levels = [] if use_vrt else _overview_levels(res.RasterXSize, res.RasterYSize)
+    if levels:
+        log(f"构建内部概览 (overviews)：{levels}")
+        res.BuildOverviews("AVERAGE", levels)
+
+    # 直接复用 Warp 返回的数据集，避免重新打开（并规避 Windows 上杀软锁文件的问题）
+    try:
+        info = _compute_preview_info(warped_path, ds=res)
+    finally:
+        res = None
     if info.suggested_max_zoom is not None:
         log(f"建议最大缩放级别：{info.suggested_max_zoom}")
     return info
 
 
-def _compute_preview_info(warped_path: Path) -> RasterPreviewInfo:
+def _intermediate_creation_options() -> list[str]:
+    # 256x256 blocks match gdal2tiles' tile size; ZSTD decodes noticeably
+    # faster than DEFLATE, which matters since gdal2tiles re-reads the file a lot.
+    compress = ["COMPRESS=DEFLATE"]
+    try:
+        drv = gdal.GetDriverByName("GTiff")  # type: ignore[attr-defined]
+        opt_list = drv.GetMetadataItem("DMD_CREATIONOPTIONLIST") or ""
+        if "ZSTD" in opt_list:
+            compress = ["COMPRESS=ZSTD", "ZSTD_LEVEL=6"]
+    except Exception:
+        pass
+
+    return [
+        "TILED=YES",
+        "BLOCKXSIZE=256",
+        "BLOCKYSIZE=256",
+        *compress,
+        "PREDICTOR=2",
+        "BIGTIFF=IF_SAFER",
+        "NUM_THREADS=ALL_CPUS",
+    ]
+
+
+def _has_overviews(ds) -> bool:
+    try:
+        return ds.GetRasterBand(1).GetOverviewCount() > 0
+    except Exception:
+        return False
+
+
+def _overview_levels(width: int, height: int, min_size: int = 256) -> list[int]:
+    # Stop once the overview would be smaller than one web tile.
+    levels: list[int] = []
+    factor = 2
+    while factor <= 128 and max(width, height) // factor >= min_size:
+        levels.append(factor)
+        factor *= 2
+    return levels
+
+
+def _compute_preview_info(warped_path: Path, ds=None) -> RasterPreviewInfo:
+    """Compute map bounds/center of the warped raster.
+
+    ``ds`` may be an already open dataset for ``warped_path``; otherwise the
+    file is opened from disk.
+    """
     ensure_gdal_available()
 
-    ds = gdal.OpenEx(str(warped_path), gdal.OF_RASTER)  # type: ignore
+    if ds is None:
+        ds = gdal.OpenEx(str(warped_path), gdal.OF_RASTER)  # type: ignore
     if ds is None:
         raise RuntimeError("无法读取重投影结果")
 
@@ -304,6 +391,7 @@ def _compute_preview_info(warped_path: Path) -> RasterPreviewInfo:
         y = gt[3] + px * gt[4] + py * gt[5]
         return x, y
 
+    # 3857 -> 4326 是可分离的（经度只取决于 x，纬度只取决于 y），北向上的栅格四个角点就能给出完整范围。
     corners_3857 = [
         px_to_xy(0, 0),
         px_to_xy(w, 0),
@@ -328,8 +416,8 @@ def _compute_preview_info(warped_path: Path) -> RasterPreviewInfo:
 
     lats: list[float] = []
     lngs: list[float] = []
-    for x, y in corners_3857:
-        a, b, *_ = ct.TransformPoint(x, y)
+    # 四个角点一次 TransformPoints 调用完成，省去逐点穿越 SWIG 边界
+    for a, b, *_ in ct.TransformPoints(corners_3857):
         lon = float(a)
         lat = float(b)
 
@@ -380,27 +468,42 @@ def generate_xyz_tiles(
     min_zoom: int,
     max_zoom: int,
     log: LogFn,
+    tile_format: str = "PNG",
 ) -> None:
     ensure_gdal_available()
 
     if min_zoom < 0 or max_zoom < 0 or max_zoom < min_zoom:
         raise ValueError("Zoom 范围不合法：min_zoom/max_zoom")
+    if tile_format not in TILE_FORMATS:
+        raise ValueError(f"不支持的瓦片格式：{tile_format}")
+    if tile_format != "PNG":
+        opt = _gdal2tiles_option("--tiledriver")
+        if opt is None or tile_format not in (opt.choices or ()):
+            raise RuntimeError(f"当前 GDAL 版本的 gdal2tiles 不支持 {tile_format} 瓦片，请改用 PNG。")
 
     out_dir.mkdir(parents=True, exist_ok=True)
 
     zoom_arg = f"{min_zoom}-{max_zoom}"
 
-    # Make sure we do XYZ scheme and PNG tiles; disable built-in webviewer.
+    # Make sure we do XYZ scheme; disable built-in webviewer.
     argv = [
         "gdal2tiles.py",
         "--profile=mercator",
         f"--zoom={zoom_arg}",
         "--xyz",
-        "--tiledriver=PNG",
+        f"--tiledriver={tile_format}",
         "--webviewer=none",
         "--resume",
         "--exclude",
         "--resampling=bilinear",
+    ]
+
+    # 切片是整个流程中最耗时的部分：让 gdal2tiles 用多进程并行渲染瓦片。
+    nproc = max(1, (os.cpu_count() or 2) - 1)
+    if nproc > 1 and _gdal2tiles_option("--processes") is not None:
+        argv.append(f"--processes={nproc}")
+
+    argv += [
         str(warped_path),
         str(out_dir),
     ]
@@ -413,26 +516,48 @@ def generate_xyz_tiles(
     _run_gdal2tiles_inprocess(argv=argv, log=log)
 
 
+def _gdal2tiles_option(name: str):
+    """Return the installed gdal2tiles' optparse Option for ``name``, or None."""
+    try:
+        from osgeo_utils import gdal2tiles  # type: ignore
+    except Exception:
+        return None
+
+    optparse_init = getattr(gdal2tiles, "optparse_init", None)
+    if optparse_init is None:
+        return None
+    try:
+        return optparse_init().get_option(name)
+    except Exception:
+        return None
+
+
 class _LogStream(io.TextIOBase):
     def __init__(self, log: LogFn) -> None:
         super().__init__()
         self._log = log
-        self._buf = ""
+        # Pending fragments of the current (unterminated) line; joined only
+        # when a newline arrives, so chatty progress output stays O(n).
+        self._buf: list[str] = []
 
     def write(self, s: str) -> int:  # type: ignore[override]
         if not s:
             return 0
-        self._buf += s.replace("\r\n", "\n").replace("\r", "\n")
-        while "\n" in self._buf:
-            line, self._buf = self._buf.split("\n", 1)
-            if line.strip():
-                self._log(line.rstrip())
+        normalized = s.replace("\r\n", "\n").replace("\r", "\n")
+        self._buf.append(normalized)
+        if "\n" in normalized:
+            *lines, tail = "".join(self._buf).split("\n")
+            self._buf = [tail] if tail else []
+            for line in lines:
+                if line.strip():
+                    self._log(line.rstrip())
         return len(s)
 
     def flush(self) -> None:  # type: ignore[override]
-        if self._buf.strip():
-            self._log(self._buf.rstrip())
-        self._buf = ""
+        rest = "".join(self._buf)
+        if rest.strip():
+            self._log(rest.rstrip())
+        self._buf = []
 
 
 class _ForwardToLogHandler(logging.Handler):
@@ -449,6 +574,76 @@ class _ForwardToLogHandler(logging.Handler):
             self._log(msg)
 
 
+_TILING_CONFIG = {
+    "VSI_CACHE": "TRUE",
+    "VSI_CACHE_SIZE": str(256 * 1024 * 1024),
+}
+
+
+def _tiling_cache_bytes() -> int:
+    # 1 GB, but never more than a quarter of the currently free memory.
+    size = 1024 * 1024 * 1024
+    try:
+        import psutil  # type: ignore
+
+        size = min(size, psutil.virtual_memory().available // 4)
+    except Exception:
+        pass
+    return max(size, 64 * 1024 * 1024)
+
+
+def _processes_from_argv(argv: list[str]) -> int:
+    for a in argv:
+        if a.startswith("--processes="):
+            try:
+                return max(1, int(a.split("=", 1)[1]))
+            except ValueError:
+                break
+    return 1
+
+
+def _hilbert_index(n: int, x: int, y: int) -> int:
+    """Distance of (x, y) along a Hilbert curve filling an n x n grid (n = 2^k)."""
+    d = 0
+    s = n // 2
+    while s > 0:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        d += s * s * ((3 * rx) ^ ry)
+        if ry == 0:
+            if rx == 1:
+                x = n - 1 - x
+                y = n - 1 - y
+            x, y = y, x
+        s //= 2
+    return d
+
+
+def _hilbert_ordered(generate_base_tiles):
+    """Wrap GDAL2Tiles.generate_base_tiles to return its tiles in Hilbert order.
+
+    Only the order changes; the set of tiles is untouched. Unknown return
+    shapes (other gdal2tiles versions) are passed through as-is.
+    """
+
+    def wrapper(self, *args, **kwargs):
+        result = generate_base_tiles(self, *args, **kwargs)
+        try:
+            conf, tile_details = result
+            min_x = min(t.tx for t in tile_details)
+            min_y = min(t.ty for t in tile_details)
+            span = max(max(t.tx - min_x, t.ty - min_y) for t in tile_details) + 1
+            n = 1 << (span - 1).bit_length()
+            tile_details = sorted(
+                tile_details, key=lambda t: _hilbert_index(n, t.tx - min_x, t.ty - min_y)
+            )
+        except Exception:
+            return result
+        return conf, tile_details
+
+    return wrapper
+
+
 def _run_gdal2tiles_inprocess(argv: list[str], log: LogFn) -> None:
     try:
         from osgeo_utils import gdal2tiles  # type: ignore
@@ -463,6 +658,32 @@ def _run_gdal2tiles_inprocess(argv: list[str], log: LogFn) -> None:
     g2t_logger.addHandler(handler)
     g2t_logger.setLevel(logging.INFO)
 
+    # Neighbouring tiles read overlapping source blocks: a larger block cache
+    # (and VSI read cache) avoids decoding the same block again and again.
+    cache_bytes = _tiling_cache_bytes()
+    tiling_config = dict(_TILING_CONFIG)
+    # Worker processes share the same budget. They may be spawned as fresh
+    # processes, so their block cache goes through the environment too; a
+    # user-set GDAL_CACHEMAX is left alone.
+    set_cache_env = "GDAL_CACHEMAX" not in os.environ
+    if set_cache_env:
+        per_worker_mb = max(cache_bytes // _processes_from_argv(argv) // (1024 * 1024), 64)
+        tiling_config["GDAL_CACHEMAX"] = str(per_worker_mb)
+        os.environ["GDAL_CACHEMAX"] = tiling_config["GDAL_CACHEMAX"]
+
+    old_cache_max = gdal.GetCacheMax()  # type: ignore[attr-defined]
+    old_config = {k: gdal.GetConfigOption(k) for k in tiling_config}  # type: ignore[attr-defined]
+    gdal.SetCacheMax(cache_bytes)  # type: ignore[attr-defined]
+    for k, v in tiling_config.items():
+        gdal.SetConfigOption(k, v)  # type: ignore[attr-defined]
+
+    # Render base tiles along a Hilbert curve instead of row by row, so that
+    # consecutive tiles (and each worker's chunk) hit recently cached blocks.
+    g2t_cls = getattr(gdal2tiles, "GDAL2Tiles", None)
+    orig_base_tiles = getattr(g2t_cls, "generate_base_tiles", None)
+    if orig_base_tiles is not None:
+        g2t_cls.generate_base_tiles = _hilbert_ordered(orig_base_tiles)  # type: ignore[union-attr]
+
     # Also capture stdout/stderr (progress bars / prints).
     stream = _LogStream(log)
     try:
@@ -475,16 +696,23 @@ def _run_gdal2tiles_inprocess(argv: list[str], log: LogFn) -> None:
             pass
         g2t_logger.removeHandler(handler)
         g2t_logger.setLevel(old_level)
+        gdal.SetCacheMax(old_cache_max)  # type: ignore[attr-defined]
+        for k, v in old_config.items():
+            gdal.SetConfigOption(k, v)  # type: ignore[attr-defined]
+        if set_cache_env:
+            os.environ.pop("GDAL_CACHEMAX", None)
+        if orig_base_tiles is not None:
+            g2t_cls.generate_base_tiles = orig_base_tiles  # type: ignore[union-attr]
 
     if rc != 0:
         raise RuntimeError(f"gdal2tiles 执行失败，退出码={rc}")
 
 
-def guess_xyz_tiles_url_template(out_dir: Path) -> tuple[str, Path | None]:
+def guess_xyz_tiles_url_template(out_dir: Path, ext: str = "png") -> tuple[str, Path | None]:
     """Guess tiles url template relative to out_dir/index.html.
 
     正常情况下 gdal2tiles 会在 out_dir 下生成：
-      {z}/{x}/{y}.png
+      {z}/{x}/{y}.{ext}
 
     但在某些环境/参数组合下，可能会多一层目录（例如 out_dir/tiles/{z}/{x}/{y}.png）。
     这里做一个轻量探测，让 index.html 不至于空白。
@@ -494,26 +722,26 @@ def guess_xyz_tiles_url_template(out_dir: Path) -> tuple[str, Path | None]:
     root = _find_tiles_root(out_dir)
     rel = root.relative_to(out_dir).as_posix()
     prefix = "." if rel == "." else f"./{rel}"
-    template = f"{prefix}/{{z}}/{{x}}/{{y}}.png"
-    sample = _find_any_png_under(root)
+    template = f"{prefix}/{{z}}/{{x}}/{{y}}.{ext}"
+    sample = _find_any_tile_under(root, ext)
     return template, sample
 
 
+_ZOOM_DIR_NAMES = frozenset(str(z) for z in range(0, 31))
+
+
 def _find_tiles_root(out_dir: Path) -> Path:
     # Check out_dir/{0..30} existence first (fast path)
-    for z in range(0, 31):
-        p = out_dir / str(z)
-        if p.is_dir():
-            return out_dir
+    if _has_zoom_dirs(out_dir):
+        return out_dir
 
     # One-level deep search for a directory containing numeric zoom dirs
     try:
-        for child in out_dir.iterdir():
-            if not child.is_dir():
-                continue
-            for z in range(0, 31):
-                if (child / str(z)).is_dir():
-                    return child
+        with os.scandir(out_dir) as it:
+            children = [e.path for e in it if e.is_dir()]
+        for child in children:
+            if _has_zoom_dirs(child):
+                return Path(child)
     except Exception:
         pass
 
@@ -521,80 +749,22 @@ def _find_tiles_root(out_dir: Path) -> Path:
     return out_dir
 
 
-def _find_any_png_under(root: Path) -> Path | None:
-    # Depth-limited search for a sample tile path for debugging.
-    # root/{z}/{x}/{y}.png
+def _has_zoom_dirs(path: Path | str) -> bool:
+    # One directory scan instead of stat'ing each of the 31 zoom names.
     try:
-        for z_dir in root.iterdir():
-            if not z_dir.is_dir() or not z_dir.name.isdigit():
-                continue
-            for x_dir in z_dir.iterdir():
-                if not x_dir.is_dir() or not x_dir.name.isdigit():
-                    continue
-                for f in x_dir.iterdir():
-                    if f.is_file() and f.suffix.lower() == ".png":
-                        return f
-    except Exception:
-        return None
-    return None
-
-
-def _detect_gdal2tiles_command(log: LogFn) -> list[str]:
-    # Prefer module invocation to ensure we use the same interpreter/environment.
-    candidates: list[list[str]] = [
-        [sys.executable, "-m", "osgeo_utils.gdal2tiles"],
-        [sys.executable, "-m", "gdal2tiles"],
-        ["gdal2tiles"],
-        ["gdal2tiles.py"],
-    ]
-
-    for cmd in candidates:
-        if _probe_command(cmd + ["--help"]):
-            log(f"找到 gdal2tiles：{' '.join(cmd)}")
-            return cmd
-
-    raise RuntimeError(
-        "未找到 gdal2tiles。\n"
-        f"{environment_hint()}\n\n"
-        "请确认 GDAL 安装正确（包含 gdal2tiles）。\n"
-        "如果你使用项目根目录的 wheel：\n"
-        "  python -m pip install .\\GDAL-3.10.1-cp312-cp312-win_amd64.whl\n"
-    )
+        with os.scandir(path) as it:
+            return any(e.name in _ZOOM_DIR_NAMES and e.is_dir() for e in it)
+    except OSError:
+        return False
 
 
-def _probe_command(cmd: list[str]) -> bool:
+def _find_any_tile_under(root: Path, ext: str = "png") -> Path | None:
+    # Depth-limited search for a sample tile path for debugging.
+    # root/{z}/{x}/{y}.{ext} -- glob is lazy, so stop at the first hit.
     try:
-        p = subprocess.run(
-            cmd,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=False,
-            shell=False,
-        )
-        return p.returncode == 0
+        return next((p for p in root.glob(f"[0-9]*/[0-9]*/*.{ext}") if p.is_file()), None)
     except Exception:
-        return False
-
-
-def _run_with_live_output(args: list[str], cwd: Path, log: LogFn) -> None:
-    p = subprocess.Popen(
-        args,
-        cwd=str(cwd),
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
-        universal_newlines=True,
-        shell=False,
-    )
-    assert p.stdout is not None
-    for line in p.stdout:
-        line = line.rstrip("\n")
-        if line:
-            log(line)
-    code = p.wait()
-    if code != 0:
-        raise RuntimeError(f"gdal2tiles 执行失败，退出码={code}")
+        return None
 
 
 def _quote_for_log(s: str) -> str:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import html
 from dataclasses import dataclass
 
 
@@ -17,17 +18,17 @@ class PreviewConfig:
     tiles_url_template: str = "./{z}/{x}/{y}.png"
 
 
-def build_leaflet_preview_html(cfg: PreviewConfig) -> str:
-    # NOTE: Google Satellite tile URL is unofficial and may be rate-limited.
-    # In practice it works for many internal/preview uses.
-    # 尽量贴近用户给的“可用模板”：简单、直观、少魔法。
-    # 同时保留我们计算出的 bounds，优先 fitBounds 让打开即看到影像范围。
-    return f"""<!DOCTYPE html>
+# Leaflet preview page; placeholders are filled by build_leaflet_preview_html.
+# NOTE: Google Satellite tile URL is unofficial and may be rate-limited.
+# In practice it works for many internal/preview uses.
+# 尽量贴近用户给的“可用模板”：简单、直观、少魔法。
+# 同时保留我们计算出的 bounds，优先 fitBounds 让打开即看到影像范围。
+_TEMPLATE = """<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{_escape_html(cfg.title)}</title>
+    <title>{title}</title>
     <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" />
     <style>
         body {{ margin: 0; padding: 0; }}
@@ -49,9 +50,9 @@ def build_leaflet_preview_html(cfg: PreviewConfig) -> str:
         }});
 
         // 叠加层：本地瓦片 (Overlay Layer)
-        var localTiles = L.tileLayer('{cfg.tiles_url_template}', {{
-            minZoom: {cfg.min_zoom},
-            maxZoom: {cfg.max_zoom},
+        var localTiles = L.tileLayer('{tiles_url_template}', {{
+            minZoom: {min_zoom},
+            maxZoom: {max_zoom},
             tms: false,
             opacity: 1.0,
             attribution: 'Local Tiles'
@@ -60,8 +61,8 @@ def build_leaflet_preview_html(cfg: PreviewConfig) -> str:
         // --- 2. 初始化地图 ---
         // 先用中心点/建议 zoom 初始化，随后若 bounds 合法则 fitBounds
         var map = L.map('map', {{
-            center: [{cfg.center_lat}, {cfg.center_lng}],
-            zoom: {min(cfg.max_zoom, max(cfg.min_zoom, max(0, cfg.min_zoom + 2)))},
+            center: [{center_lat}, {center_lng}],
+            zoom: {initial_zoom},
             layers: [googleSat, localTiles]
         }});
 
@@ -78,8 +79,8 @@ def build_leaflet_preview_html(cfg: PreviewConfig) -> str:
 
         // --- 4. 自动定位到影像范围 ---
         var bounds = L.latLngBounds(
-            L.latLng({cfg.bounds_sw_lat}, {cfg.bounds_sw_lng}),
-            L.latLng({cfg.bounds_ne_lat}, {cfg.bounds_ne_lng})
+            L.latLng({bounds_sw_lat}, {bounds_sw_lng}),
+            L.latLng({bounds_ne_lat}, {bounds_ne_lng})
         );
         if (bounds.isValid()) {{
             map.fitBounds(bounds, {{ padding: [20, 20] }});
@@ -90,11 +91,23 @@ def build_leaflet_preview_html(cfg: PreviewConfig) -> str:
 """
 
 
-def _escape_html(s: str) -> str:
-    return (
-        s.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
-        .replace("'", "&#39;")
+def build_leaflet_preview_html(cfg: PreviewConfig) -> str:
+    return _TEMPLATE.format_map(
+        {
+            "title": _escape_html(cfg.title),
+            "tiles_url_template": cfg.tiles_url_template,
+            "min_zoom": cfg.min_zoom,
+            "max_zoom": cfg.max_zoom,
+            "center_lat": cfg.center_lat,
+            "center_lng": cfg.center_lng,
+            "initial_zoom": min(cfg.max_zoom, max(cfg.min_zoom, max(0, cfg.min_zoom + 2))),
+            "bounds_sw_lat": cfg.bounds_sw_lat,
+            "bounds_sw_lng": cfg.bounds_sw_lng,
+            "bounds_ne_lat": cfg.bounds_ne_lat,
+            "bounds_ne_lng": cfg.bounds_ne_lng,
+        }
     )
+
+
+def _escape_html(s: str) -> str:
+    return html.escape(s, quote=True)
@@ -3,10 +3,17 @@ from tkinter import ttk, filedialog, messagebox
 from tkinter import font as tkfont
 import os
 import json
+import multiprocessing
+from operator import attrgetter, itemgetter
+import functools
+import hashlib
+import re
 import shutil
 import sys
-import subprocess
-from pathlib import Path
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from types import MappingProxyType
+from typing import Mapping
 import warnings
 import importlib.util
 
@@ -18,110 +25,677 @@ def _set_env_if_missing(var_name: str, value: str) -> bool:
     return True
 
 
-def _try_configure_proj_and_gdal_data() -> None:
-    """
-    在 Windows/venv 场景下，GDAL/PROJ 的数据文件（proj.db、gcs.csv 等）
-    可能无法自动定位，导致 Warning 1: Cannot find proj.db。
+# 可选依赖：装了 orjson 就用它读写坐标 JSON，否则回退到标准库 json
+if importlib.util.find_spec("orjson") is not None:
+    import orjson
+else:
+    orjson = None
 
-    这里做一个“尽力而为”的自动探测：如果找得到就设置 PROJ_LIB / GDAL_DATA。
+_NON_SPACE_RE = re.compile(r"\S")
+_PREVIEW_MAX_CHARS = 16384
+# GCP 列表每次滚动到底部附近时追加的行数
+_GCP_TREE_BATCH = 200
+_GCP_TREE_COLUMNS = ("no", "pixel", "line", "x", "y", "z", "id")
+
+# gdal 数据目录里通常会有 gcs.csv / pcs.csv 等文件
+_GDAL_DATA_MARKERS = frozenset({"gcs.csv", "pcs.csv"})
+
+
+def _env_cache_file() -> str:
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "GeoMosaic", "env.json")
+
+
+def _is_proj_dir(p) -> bool:
+    return bool(p) and os.path.isfile(os.path.join(p, "proj.db"))
+
+
+def _is_gdal_data_dir(p) -> bool:
+    return bool(p) and (
+        os.path.isfile(os.path.join(p, "gcs.csv")) or os.path.isfile(os.path.join(p, "pcs.csv"))
+    )
+
+
+def _load_cached_data_dirs(key: str) -> tuple[str | None, str | None]:
+    try:
+        with open(_env_cache_file(), "rb") as f:
+            entry = json.loads(f.read()).get(key) or {}
+    except (OSError, ValueError, AttributeError):
+        return None, None
+    proj_dir = entry.get("proj")
+    gdal_dir = entry.get("gdal")
+    # 缓存的路径已失效（卸载/移动了环境）则当作未命中，重新探测
+    if not _is_proj_dir(proj_dir) or not _is_gdal_data_dir(gdal_dir):
+        return None, None
+    return proj_dir, gdal_dir
+
+
+def _save_cached_data_dirs(key: str, proj_dir: str | None, gdal_dir: str | None) -> None:
+    path = _env_cache_file()
+    try:
+        try:
+            with open(path, "rb") as f:
+                cache = json.loads(f.read())
+            if not isinstance(cache, dict):
+                cache = {}
+        except (OSError, ValueError):
+            cache = {}
+        cache[key] = {"proj": proj_dir, "gdal": gdal_dir}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=1)
+def _probe_proj_and_gdal_data(prefix: str, executable: str) -> tuple[str | None, str | None]:
+    """逐个候选目录探测 PROJ / GDAL 数据目录，返回 (proj_dir, gdal_data_dir)。
+
+    executable 只参与缓存键：同一 prefix 下换了解释器也会重新探测。
     """
-    prefix = Path(sys.prefix)
+    join = os.path.join
+    proj_dir: str | None = None
+    gdal_data_dir: str | None = None
 
     # 兜底：直接从 osgeo 包位置推断 data 目录（不依赖 sys.prefix 是否指向 venv）
-    osgeo_data_dir: Path | None = None
+    # 依次尝试：已导入的 osgeo -> venv/Windows 常见布局 -> find_spec（要走完整的 meta_path 查找，最慢）
+    osgeo_data_dir: str | None = None
     try:
-        spec = importlib.util.find_spec("osgeo")
-        if spec and spec.submodule_search_locations:
-            osgeo_pkg_dir = Path(list(spec.submodule_search_locations)[0])
-            cand = osgeo_pkg_dir / "data"
-            if cand.is_dir():
+        osgeo_pkg_dir = None
+        mod = sys.modules.get("osgeo")
+        if mod is not None and getattr(mod, "__file__", None):
+            osgeo_pkg_dir = os.path.dirname(mod.__file__)
+        else:
+            cand = join(prefix, "Lib", "site-packages", "osgeo")
+            if os.path.isfile(join(cand, "__init__.py")):
+                osgeo_pkg_dir = cand
+            else:
+                spec = importlib.util.find_spec("osgeo")
+                if spec and spec.submodule_search_locations:
+                    osgeo_pkg_dir = list(spec.submodule_search_locations)[0]
+        if osgeo_pkg_dir:
+            cand = join(osgeo_pkg_dir, "data")
+            if os.path.isdir(cand):
                 osgeo_data_dir = cand
     except Exception:
         osgeo_data_dir = None
 
-    proj_candidates = [
+    # 一份有序候选表，标记每个目录可能是 PROJ 数据（P）还是 GDAL 数据（G）；
+    # 各自的先后顺序与原先两张候选表一致，两者都找到后立即结束
+    site_osgeo_data = join(prefix, "Lib", "site-packages", "osgeo", "data")
+    candidates: list[tuple[str, str]] = []
+    if osgeo_data_dir is not None:
+        candidates += [
+            (join(osgeo_data_dir, "proj"), "P"),
+            (join(osgeo_data_dir, "gdal"), "G"),
+            (osgeo_data_dir, "PG"),
+        ]
+    candidates += [
         # 常见 venv / 系统布局
-        prefix / "share" / "proj",
-        prefix / "Library" / "share" / "proj",  # conda
+        (join(prefix, "share", "proj"), "P"),
+        (join(prefix, "share", "gdal"), "G"),
+        # conda
+        (join(prefix, "Library", "share", "proj"), "P"),
+        (join(prefix, "Library", "share", "gdal"), "G"),
         # pyproj 自带的 proj 数据目录（如果装了 pyproj）
-        prefix / "Lib" / "site-packages" / "pyproj" / "proj_dir" / "share" / "proj",
+        (join(prefix, "Lib", "site-packages", "pyproj", "proj_dir", "share", "proj"), "P"),
         # 某些打包方式可能放在 osgeo 包内
-        prefix / "Lib" / "site-packages" / "osgeo" / "data" / "proj",
-        prefix / "Lib" / "site-packages" / "osgeo" / "data",
+        (join(site_osgeo_data, "proj"), "P"),
+        (join(site_osgeo_data, "gdal"), "G"),
+        (site_osgeo_data, "PG"),
     ]
 
-    if osgeo_data_dir is not None:
-        proj_candidates.insert(0, osgeo_data_dir / "proj")
-        proj_candidates.insert(1, osgeo_data_dir)
+    for p, kinds in candidates:
+        want_proj = proj_dir is None and "P" in kinds
+        want_gdal = gdal_data_dir is None and "G" in kinds
+        if want_gdal:
+            # 一次 listdir 同时判断 proj.db 与 gcs.csv/pcs.csv
+            try:
+                entries = set(os.listdir(p))
+            except OSError:
+                continue
+            if entries & _GDAL_DATA_MARKERS:
+                gdal_data_dir = p
+            if want_proj and "proj.db" in entries:
+                proj_dir = p
+        elif want_proj:
+            # 每个候选目录只做一次系统调用：不存在的目录同样只是一次失败的 stat
+            if os.path.isfile(join(p, "proj.db")):
+                proj_dir = p
+        if proj_dir is not None and gdal_data_dir is not None:
+            break
+
+    return proj_dir, gdal_data_dir
+
 
-    for p in proj_candidates:
+def _try_configure_proj_and_gdal_data() -> None:
+    """
+    在 Windows/venv 场景下，GDAL/PROJ 的数据文件（proj.db、gcs.csv 等）
+    可能无法自动定位，导致 Warning 1: Cannot find proj.db。
+
+    这里做一个“尽力而为”的自动探测：如果找得到就设置 PROJ_LIB / GDAL_DATA。
+    探测结果按 (sys.prefix, sys.executable) 缓存到本地配置目录，下次启动直接复用。
+    """
+    # 打开文件时不再列举整个目录（网络盘/文件很多的目录上会卡住）。
+    # 取值 TRUE 而不是 EMPTY_DIR：EMPTY_DIR 会让 GDAL 认为目录为空，从而找不到
+    # .tfw/.aux.xml 等旁车文件里的地理参考；TRUE 仍会逐个 stat 这些候选文件。
+    _set_env_if_missing("GDAL_DISABLE_READDIR_ON_OPEN", "TRUE")
+    _set_env_if_missing("GDAL_CACHEMAX", "512")
+    # 压缩的分块 TIFF 读写时可多线程编解码（与 geomosaic 后端一致）
+    _set_env_if_missing("GDAL_NUM_THREADS", "ALL_CPUS")
+
+    # 三个变量都已设置时 _set_env_if_missing 什么也不会改，直接跳过探测
+    if all(os.environ.get(k) for k in ("PROJ_LIB", "PROJ_DATA", "GDAL_DATA")):
+        return
+
+    key = f"{sys.prefix}|{sys.executable}"
+    proj_dir, gdal_data_dir = _load_cached_data_dirs(key)
+    if proj_dir is None:
+        proj_dir, gdal_data_dir = _probe_proj_and_gdal_data(sys.prefix, sys.executable)
+        if proj_dir and gdal_data_dir:
+            _save_cached_data_dirs(key, proj_dir, gdal_data_dir)
+
+    if proj_dir:
+        # PROJ_LIB 是旧变量，PROJ_DATA 是新变量；两者都设置最兼容
+        _set_env_if_missing("PROJ_LIB", proj_dir)
+        _set_env_if_missing("PROJ_DATA", proj_dir)
+    if gdal_data_dir:
+        _set_env_if_missing("GDAL_DATA", gdal_data_dir)
+
+
+_try_configure_proj_and_gdal_data()
+
+# osgeo.gdal 的导入（大量 DLL 加载 + 驱动注册）很慢：延迟到首次使用，
+# 窗口显示后再在后台线程里预加载，见 _import_gdal()。
+gdal = None
+_GDAL_IMPORT_ERROR = ""
+_GDAL_IMPORT_LOCK = threading.Lock()
+
+
+def _import_gdal() -> bool:
+    global gdal, _GDAL_IMPORT_ERROR
+    with _GDAL_IMPORT_LOCK:
+        if gdal is not None:
+            return True
+        if _GDAL_IMPORT_ERROR:
+            return False
         try:
-            if (p / "proj.db").is_file():
-                # PROJ_LIB 是旧变量，PROJ_DATA 是新变量；两者都设置最兼容
-                _set_env_if_missing("PROJ_LIB", str(p))
-                _set_env_if_missing("PROJ_DATA", str(p))
-                break
-        except OSError:
-            continue
+            from osgeo import gdal as _gdal
+        except Exception as e:  # pragma: no cover
+            _GDAL_IMPORT_ERROR = str(e)
+            return False
+        # 避免 FutureWarning，并统一以异常方式抛出 GDAL 错误
+        try:
+            _gdal.UseExceptions()
+        except Exception:
+            # 降噪：UseExceptions 没能生效时，把“未显式 UseExceptions”的 FutureWarning 静音；
+            # 正常情况下不注册，避免进程内每次 warnings.warn 都多匹配一条正则
+            warnings.filterwarnings(
+                "ignore",
+                message=r".*UseExceptions\(\).*",
+                category=FutureWarning,
+                module=r"osgeo\.gdal",
+            )
+        gdal = _gdal
+        return True
+
+
+# 一次取出 GCP 的 7 个字段（C 实现的 attrgetter，代替逐个属性访问）
+_GCP_FIELDS = attrgetter("Id", "Info", "GCPPixel", "GCPLine", "GCPX", "GCPY", "GCPZ")
+# GCP 的字段名，顺序与 _GCP_FIELDS 一致
+_GCP_KEYS = ("id", "info", "pixel", "line", "x", "y", "z")
+_GCP_ROW = itemgetter(*_GCP_KEYS)
+
+# 坐标文件格式：v2 按列存 GCP（"gcps": {"id": [...], "x": [...], ...}）；v1 是逐点字典列表，仍可读取
+_GEOREF_FORMAT = "geomosaic_georef_v2"
+_GEOREF_FORMATS = frozenset({"geomosaic_georef_v1", _GEOREF_FORMAT})
+
+
+def _gcp_columns(data: Mapping) -> list | None:
+    """返回按 _GCP_KEYS 顺序的 7 列 GCP 数据；没有 GCP 时返回 None。字段缺失时抛 ValueError。"""
+    gcps = data.get("gcps")
+    if not gcps:
+        return None
+    if isinstance(gcps, Mapping):
+        missing = [k for k in _GCP_KEYS if k not in gcps]
+        if missing:
+            raise ValueError(f"坐标文件中 GCP 缺少字段：{', '.join(missing)}")
+        cols = [gcps[k] for k in _GCP_KEYS]
+        if len({len(c) for c in cols}) != 1:
+            raise ValueError("坐标文件中 GCP 各字段的长度不一致。")
+        return cols if cols[0] else None
+
+    # v1：先整体校验一次字段齐全，再一次性转置成列
+    missing = next(
+        ((i, k) for i, g in enumerate(gcps, start=1) for k in _GCP_KEYS if k not in g),
+        None,
+    )
+    if missing is not None:
+        raise ValueError(f"坐标文件中第 {missing[0]} 个 GCP 缺少字段：{missing[1]}")
+    return [list(c) for c in zip(*map(_GCP_ROW, gcps))]
 
-    gdal_data_candidates = [
-        prefix / "share" / "gdal",
-        prefix / "Library" / "share" / "gdal",  # conda
-        prefix / "Lib" / "site-packages" / "osgeo" / "data" / "gdal",
-        prefix / "Lib" / "site-packages" / "osgeo" / "data",
-    ]
 
-    if osgeo_data_dir is not None:
-        gdal_data_candidates.insert(0, osgeo_data_dir / "gdal")
-        gdal_data_candidates.insert(1, osgeo_data_dir)
+def _open_geotiff_readonly(input_file: str):
+    # 只让 GTiff 驱动识别，省去逐个驱动探测；不是 GTiff（或旧版 GDAL 没有 OpenEx）时回退到 gdal.Open
+    try:
+        ds = gdal.OpenEx(input_file, gdal.OF_RASTER | gdal.OF_READONLY, allowed_drivers=["GTiff"])
+    except Exception:
+        ds = None
+    if ds is None:
+        ds = gdal.Open(input_file, gdal.GA_ReadOnly)
+    return ds
+
 
-    for p in gdal_data_candidates:
+def _read_georef(input_file: str) -> dict:
+    ds = _open_geotiff_readonly(input_file)
+    if ds is None:
+        raise RuntimeError("无法打开输入 GeoTIFF（GDAL.Open 返回 None）。")
+
+    try:
+        gt = None
         try:
-            if p.is_dir():
-                # gdal 数据目录里通常会有 gcs.csv / pcs.csv 等文件
-                if (p / "gcs.csv").is_file() or (p / "pcs.csv").is_file():
-                    _set_env_if_missing("GDAL_DATA", str(p))
-                    break
-        except OSError:
-            continue
+            gt = ds.GetGeoTransform(can_return_null=True)
+        except TypeError:
+            # 兼容旧版 GDAL：没有 can_return_null 参数
+            gt = ds.GetGeoTransform()
+
+        projection_wkt = ds.GetProjection() or ""
+        gcp_projection_wkt = ds.GetGCPProjection() or ""
+        gcps = ds.GetGCPs() or []
+        src_name = os.path.basename(input_file)
+        meta = ds.GetMetadata() or {}
+        gt_list = list(gt) if gt else None
+
+        # 按列存放：每个字段一个列表，读回时直接 zip，无需逐点查字典
+        cols = list(zip(*map(_GCP_FIELDS, gcps))) or [()] * len(_GCP_KEYS)
+
+        data = {
+            "format": _GEOREF_FORMAT,
+            "source_file": src_name,
+            "raster_size": [ds.RasterXSize, ds.RasterYSize],
+            "geotransform": gt_list,
+            "projection_wkt": projection_wkt,
+            "gcp_projection_wkt": gcp_projection_wkt,
+            "gcps": {k: list(c) for k, c in zip(_GCP_KEYS, cols)},
+            "metadata": meta,
+        }
+    finally:
+        ds = None
+
+    return data
+
+
+@functools.lru_cache(maxsize=8)
+def _read_georef_cached(abspath: str, mtime_ns: int, size: int) -> Mapping:
+    # 结果在多次调用间共享：返回只读视图，避免调用方意外修改缓存
+    return MappingProxyType(_read_georef(abspath))
+
+
+def _file_cache_key(path: str) -> tuple[str, int] | None:
+    try:
+        return os.path.abspath(path), os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _all_ascii(obj) -> bool:
+    if isinstance(obj, str):
+        return obj.isascii()
+    if isinstance(obj, Mapping):
+        return all(k.isascii() if isinstance(k, str) else True for k in obj) and all(map(_all_ascii, obj.values()))
+    if isinstance(obj, (list, tuple)):
+        return all(map(_all_ascii, obj))
+    return True
 
 
-_try_configure_proj_and_gdal_data()
+def _json_loads(raw: bytes):
+    # 记事本等编辑器另存时可能带 UTF-8 BOM，orjson 不接受，先去掉
+    if raw[:3] == b"\xef\xbb\xbf":
+        raw = raw[3:]
+    # GCP 很多时 orjson 解析快得多；没装就用标准库（同样接受 bytes）
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
-try:
-    from osgeo import gdal
-except Exception as _e:  # pragma: no cover
-    gdal = None
-    _GDAL_IMPORT_ERROR = str(_e)
-else:
-    _GDAL_IMPORT_ERROR = ""
-    # 避免 FutureWarning，并统一以异常方式抛出 GDAL 错误
+
+def _fmt_gt(gt) -> str:
+    # 6 个数字不值得走完整的 JSON 编码器；repr 与 json.dumps 对浮点数的输出一致
+    return "[" + ", ".join(map(repr, gt)) + "]"
+
+
+@functools.lru_cache(maxsize=1)
+def _directory_opener() -> list[str]:
+    """命令行形式的“用文件管理器打开目录”（非 Windows），首次使用时解析一次。"""
+    if sys.platform == "darwin":
+        candidates = [["open"]]
+    else:
+        candidates = [["xdg-open"], ["gio", "open"]]
+    for cmd in candidates:
+        exe = shutil.which(cmd[0])
+        if exe:
+            return [exe] + cmd[1:]
+    raise FileNotFoundError("未找到可用的目录打开命令（xdg-open / gio）。")
+
+
+_COPY_CHUNK = 1 << 30
+_COPY_BUFSIZE = 4 * 1024 * 1024
+
+
+def _fast_copy(src: str, dst: str) -> None:
+    """复制文件并保留时间戳（等价于 shutil.copy2），尽量让内核直接搬运数据。
+
+    依次尝试 os.copy_file_range（Linux）、os.sendfile，最后回退到 4MB 缓冲的 copyfileobj。
+    """
+    # 与 shutil.copy2 一致：源和目标是同一个文件时报错，而不是先把目标（也就是源）截断
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} 和 {dst!r} 是同一个文件")
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(src_fd).st_size
+        done = False
+        for name in ("copy_file_range", "sendfile"):
+            kernel_copy = getattr(os, name, None)
+            if kernel_copy is None:
+                continue
+            copied = 0
+            try:
+                while True:
+                    if name == "sendfile":
+                        n = kernel_copy(dst_fd, src_fd, copied, _COPY_CHUNK)
+                    else:
+                        n = kernel_copy(src_fd, dst_fd, _COPY_CHUNK, copied, copied)
+                    if n == 0:
+                        break
+                    copied += n
+            except OSError:
+                copied = -1
+            # 某些文件系统/内核组合下会对非空文件直接返回 0 而不报错：按字节数核对，不足就换下一种方式
+            if copied == size:
+                done = True
+                break
+            # 文件系统/平台不支持或未复制完整：清空目标，换下一种方式
+            os.ftruncate(dst_fd, 0)
+        if not done:
+            os.lseek(src_fd, 0, os.SEEK_SET)
+            os.lseek(dst_fd, 0, os.SEEK_SET)
+            shutil.copyfileobj(fsrc, fdst, _COPY_BUFSIZE)
+    shutil.copystat(src, dst)
+
+
+@functools.lru_cache(maxsize=16)
+def _abspath_cached(path: str) -> str:
+    # “打开输出目录”会被反复点击：只缓存绝对路径；目录是否存在每次都要重新判断
+    return os.path.abspath(path)
+
+
+def _spawn_detached(argv: list[str]) -> None:
+    # posix_spawn 直接启动，不经过 subprocess 的管道/fork 准备；标准输入输出指向 /dev/null
+    file_actions = [
+        (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+        (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+        (os.POSIX_SPAWN_DUP2, 1, 2),
+    ]
+    pid = os.posix_spawn(argv[0], argv, os.environ, file_actions=file_actions)
+    # 后台回收子进程，避免留下僵尸进程
+    threading.Thread(target=os.waitpid, args=(pid, 0), daemon=True).start()
+
+
+def _source_signature(path: str) -> str:
+    st = os.stat(path)
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _copy_sig_file(output_file: str) -> str:
+    # 每个输出文件一个小记录文件（按绝对路径哈希命名），放在用户缓存目录，不写进交付的 TIFF；
+    # 批量应用时各子进程只写自己的记录，互不争用
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(output_file)).encode("utf-8")).hexdigest()
+    return os.path.join(os.path.dirname(_env_cache_file()), "copies", key + ".sig")
+
+
+def _output_copied_from(output_file: str, sig: str) -> bool:
+    # 记录的是 “源 TIFF|坐标文件|写完后的输出文件” 三者的签名：输出文件被改动或替换过也要重新复制
     try:
-        gdal.UseExceptions()
-    except Exception:
+        with open(_copy_sig_file(output_file), encoding="utf-8") as f:
+            recorded = f.read()
+        return recorded == f"{sig}|{_source_signature(output_file)}"
+    except OSError:
+        return False
+
+
+def _record_output_copy(output_file: str, sig: str) -> None:
+    path = _copy_sig_file(output_file)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"{sig}|{_source_signature(output_file)}")
+    except OSError:
         pass
-    # 降噪：把“未显式 UseExceptions”的 FutureWarning 静音（在极端情况下仍可能出现）
-    warnings.filterwarnings(
-        "ignore",
-        message=r".*UseExceptions\(\).*",
-        category=FutureWarning,
-        module=r"osgeo\.gdal",
-    )
+
+
+def _forget_output_copy(output_file: str) -> None:
+    try:
+        os.remove(_copy_sig_file(output_file))
+    except OSError:
+        pass
+
+
+# 与 concurrent.futures.process 的 Windows 上限一致（WaitForMultipleObjects 的句柄数限制）
+_MAX_WINDOWS_WORKERS = 61
+
+
+def _apply_georef_from_json_standalone(
+    georef_file: str,
+    edited_file: str,
+    output_file: str,
+    use_pam: bool = False,
+    data: Mapping | None = None,
+) -> str:
+    """把坐标文件写入 TIFF，返回实际写出的文件路径。
+
+    data 为已解析的坐标文件内容（调用方确认与 georef_file 一致时传入），传入则不再读取/解析文件。
+    use_pam=True 时不复制 TIFF，只在 edited_file 旁边写 PAM 旁车文件（<edited_file>.aux.xml），
+    output_file 被忽略；GDAL 打开该 TIFF 时会优先使用旁车文件里的地理参考。
+    模块级函数：可被 ProcessPoolExecutor 在子进程中调用（见 _apply_batch）。
+    """
+    if not _import_gdal():
+        raise RuntimeError(f"无法导入 GDAL Python 绑定 (osgeo)：{_GDAL_IMPORT_ERROR}")
+
+    if data is None and not os.path.isfile(georef_file):
+        raise FileNotFoundError(f"坐标文件不存在：{georef_file}")
+    if not os.path.isfile(edited_file):
+        raise FileNotFoundError(f"编辑后的 TIFF 不存在：{edited_file}")
+
+    if data is None:
+        with open(georef_file, "rb") as f:
+            data = _json_loads(f.read())
+
+    if data.get("format") not in _GEOREF_FORMATS:
+        raise ValueError("坐标文件格式不受支持：请使用本工具导出的 TXT/GEO 文件。")
+    gcp_cols = _gcp_columns(data)
+
+    prev_pam = gdal.GetConfigOption("GDAL_PAM_ENABLED")
+    if use_pam:
+        # 只读打开时 GTiff 驱动会把 SetGeoTransform/SetGCPs 等写进 .aux.xml，不动 TIFF 本身
+        gdal.SetConfigOption("GDAL_PAM_ENABLED", "YES")
+        written = edited_file + ".aux.xml"
+        ds = gdal.Open(edited_file, gdal.GA_ReadOnly)
+        if ds is None:
+            gdal.SetConfigOption("GDAL_PAM_ENABLED", prev_pam)
+            raise RuntimeError("无法打开编辑后的 TIFF（GDAL.Open 返回 None）。")
+    else:
+        out_dir = os.path.dirname(output_file)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+
+        # 先复制一份，再在副本上写入地理参考信息，避免破坏原始编辑文件。
+        # 只有输出文件正是上次用同一版本的源 TIFF + 同一版本的坐标文件生成的（原样重复执行）时才跳过复制：
+        # 换了坐标文件就必须从干净的副本开始，否则新文件里没有的字段会残留上次写入的值
+        try:
+            georef_sig = _source_signature(georef_file)
+        except OSError:
+            georef_sig = ""
+        sig = f"{_source_signature(edited_file)}|{georef_sig}"
+        if not georef_sig or not _output_copied_from(output_file, sig):
+            # 写入中途失败时不能留下旧记录，否则下次会把半成品当作已完成
+            _forget_output_copy(output_file)
+            _fast_copy(edited_file, output_file)
+
+        written = output_file
+        ds = gdal.Open(output_file, gdal.GA_Update)
+        if ds is None:
+            raise RuntimeError("无法以更新模式打开输出 TIFF（GDAL.Open 返回 None）。")
+
+    try:
+        gt = data.get("geotransform")
+        proj = data.get("projection_wkt") or ""
+        gcp_proj = data.get("gcp_projection_wkt") or ""
+
+        # GCP 与 GeoTransform 在 GeoTIFF 里互斥（写 GCP 会覆盖仿射变换）：只写实际使用的那一种
+        if gcp_cols:
+            # JSON 解码已经得到数值，无需再逐个 float() 转换；构造函数提到局部变量
+            GCP = gdal.GCP
+            gcp_list = [
+                GCP(x, y, z, pixel, line, str(id_), str(info))
+                for id_, info, pixel, line, x, y, z in zip(*gcp_cols)
+            ]
+            ds.SetGCPs(gcp_list, gcp_proj or proj)
+        else:
+            if gt:
+                ds.SetGeoTransform(tuple(gt))
+            if proj:
+                ds.SetProjection(proj)
+
+        # 元数据按需写回（可选）；默认不覆盖，避免写入不期望的内容
+        # meta = data.get("metadata") or {}
+        # if meta:
+        #     ds.SetMetadata(meta)
+    finally:
+        # 显式关闭即会把改动写回，无需再单独 FlushCache；旧版 GDAL 没有 Close() 则靠释放引用关闭
+        try:
+            if hasattr(ds, "Close"):
+                ds.Close()
+            ds = None
+        finally:
+            if use_pam:
+                gdal.SetConfigOption("GDAL_PAM_ENABLED", prev_pam)
+
+    if not use_pam and georef_sig:
+        _record_output_copy(output_file, sig)
+    return written
+
+
+# 颜色系统：浅色背景 + 白色卡片
+_UI_BG = "#F5F7FB"
+_CARD_BG = "#FFFFFF"
+_BORDER = "#E5E7EB"
+_TEXT = "#111827"
+_MUTED = "#6B7280"
+_PRIMARY = "#2563EB"
+_PRIMARY_HOVER = "#1D4ED8"
+_PRIMARY_PRESSED = "#1E40AF"
+
+# ttk 样式表：(样式名, configure 参数, map 参数)；同一样式的参数合并成一次调用
+_STYLE_SPEC = (
+    # 全局控件基础样式
+    (".", {"font": "ui_font"}, None),
+    ("TFrame", {"background": _UI_BG}, None),
+    ("Header.TFrame", {"background": _UI_BG}, None),
+    ("TLabel", {"background": _UI_BG, "foreground": _TEXT, "font": "ui_font"}, None),
+    ("TButton", {"font": "ui_font", "padding": (10, 6)}, None),
+    # fieldbackground/foreground 在 clam 下可用；其他主题会忽略，不影响功能
+    ("TEntry", {"font": "ui_font", "padding": (8, 6), "fieldbackground": "#FFFFFF", "foreground": _TEXT}, None),
+    # Tab：明确区分选中/未选中/悬停，避免“看起来反了”
+    (
+        "TNotebook.Tab",
+        {
+            "font": "ui_font",
+            "padding": (12, 7),
+            "background": "#E9EEF6",  # 未选中：浅灰蓝
+            "foreground": _MUTED,     # 未选中：灰字
+            "borderwidth": 0,
+        },
+        {
+            "background": [
+                ("selected", _CARD_BG),  # 选中：白底（与内容卡片一致）
+                ("active", "#DDE7FF"),   # 悬停：略深
+                ("!selected", "#E9EEF6"),
+            ],
+            "foreground": [
+                ("selected", _TEXT),     # 选中：深色字
+                ("active", _TEXT),
+                ("!selected", _MUTED),
+            ],
+        },
+    ),
+    ("Title.TLabel", {"font": "title_font"}, None),
+    ("SubTitle.TLabel", {"background": _UI_BG, "foreground": _MUTED, "font": "ui_font"}, None),
+    ("Status.TLabel", {"padding": (10, 6)}, None),
+    # Notebook 背景更“干净”
+    ("TNotebook", {"background": _UI_BG, "borderwidth": 0, "tabmargins": (2, 2, 2, 0)}, None),
+    # 卡片（LabelFrame）风格：白底 + 细边框
+    ("Card.TLabelframe", {"background": _CARD_BG, "borderwidth": 1, "relief": "solid"}, None),
+    ("Card.TLabelframe.Label", {"background": _CARD_BG, "foreground": _TEXT, "font": "ui_font_bold"}, None),
+    ("Card.TFrame", {"background": _CARD_BG}, None),
+    ("Card.TLabel", {"background": _CARD_BG, "foreground": _TEXT, "font": "ui_font"}, None),
+    # GCP 列表
+    ("Treeview", {"background": _CARD_BG, "fieldbackground": _CARD_BG, "foreground": _TEXT, "font": "ui_font"}, None),
+    ("Treeview.Heading", {"font": "ui_font_bold"}, None),
+    # 主按钮：蓝色填充 + 悬停/按下态
+    (
+        "Primary.TButton",
+        {
+            "font": "ui_font_bold",
+            "padding": (12, 7),
+            "foreground": "#FFFFFF",
+            "background": _PRIMARY,
+            "borderwidth": 0,
+            "focusthickness": 0,
+            "focuscolor": "none",
+        },
+        {
+            "background": [("pressed", _PRIMARY_PRESSED), ("active", _PRIMARY_HOVER)],
+            "foreground": [("disabled", "#E5E7EB"), ("!disabled", "#FFFFFF")],
+        },
+    ),
+    # 次按钮：卡片边框风格（用于“打开输出目录”等）
+    (
+        "Secondary.TButton",
+        {
+            "padding": (10, 6),
+            "foreground": _TEXT,
+            "background": _CARD_BG,
+            "borderwidth": 1,
+            "relief": "solid",
+        },
+        {"background": [("active", "#F3F4F6"), ("pressed", "#E5E7EB")]},
+    ),
+)
+
 
 class GeoTiffToolApp:
     def __init__(self, master):
         self.master = master
         master.title("GeoTIFF 坐标处理工具")
-        master.geometry("980x680")
+        master.geometry("980x760")
         master.minsize(860, 600)
+        master.protocol("WM_DELETE_WINDOW", self._on_close)
 
         self._init_style()
 
         # Tab1 提取后的数据缓存（用于预览与保存）
-        self._extract_data: dict | None = None
+        self._extract_data: Mapping | None = None
+        # GCP 列表按需填充：_gcp_tree_cols 是全部 GCP（按列），_gcp_tree_filled 是已插入 Treeview 的行数
+        self._gcp_tree_cols: list = [[] for _ in _GCP_KEYS]
+        self._gcp_tree_filled = 0
+        # 提取在单个后台线程里做，避免大文件卡住界面；序号用来丢弃已过时的提取结果
+        self._extract_pool = ThreadPoolExecutor(max_workers=1)
+        self._extract_seq = 0
         # Tab2 嵌入页：坐标文件解析缓存 & 目标 tiff 信息缓存
         self._embed_georef_data: dict | None = None
-        self._embed_target_data: dict | None = None
+        # _embed_georef_data 对应坐标文件的 (abspath, mtime_ns)，文件未变时保存前不再重复解析
+        self._embed_georef_cache_key: tuple[str, int] | None = None
+        self._embed_target_data: Mapping | None = None
 
         self.status_var = tk.StringVar(value="就绪")
         
@@ -153,6 +727,10 @@ class GeoTiffToolApp:
         status = ttk.Label(master, textvariable=self.status_var, style="Status.TLabel", anchor="w")
         status.pack(side="bottom", fill="x")
 
+        # 先完成首帧布局，再在后台加载 GDAL，与首次绘制并行
+        master.update_idletasks()
+        threading.Thread(target=_import_gdal, daemon=True).start()
+
     def _init_style(self) -> None:
         style = ttk.Style(self.master)
         # 为了实现可控的浅色卡片风/主按钮上色，优先使用 clam（更支持自定义颜色）
@@ -164,120 +742,45 @@ class GeoTiffToolApp:
                 except Exception:
                     continue
 
-        # 字体（Windows 优先 Segoe UI / Consolas，失败则回退默认字体）
-        try:
+        # 字体（Windows 优先 Segoe UI / Consolas，系统没有该字体则回退默认字体）
+        families = set(tkfont.families(self.master))
+        if "Segoe UI" in families:
             self.ui_font = tkfont.Font(family="Segoe UI", size=10)
-            self.ui_font_bold = tkfont.Font(family="Segoe UI", size=10, weight="bold")
-            self.title_font = tkfont.Font(family="Segoe UI", size=14, weight="bold")
-            self.mono_font = tkfont.Font(family="Consolas", size=10)
-        except Exception:
+        else:
             self.ui_font = tkfont.nametofont("TkDefaultFont")
-            self.ui_font_bold = tkfont.nametofont("TkDefaultFont").copy()
-            self.ui_font_bold.configure(weight="bold")
-            self.title_font = tkfont.nametofont("TkDefaultFont").copy()
-            self.title_font.configure(size=self.ui_font.cget("size") + 4, weight="bold")
+        # 粗体/标题字体从 ui_font 复制后改字重/字号，不再重新查找字体族
+        self.ui_font_bold = self.ui_font.copy()
+        self.ui_font_bold.configure(weight="bold")
+        self.title_font = self.ui_font.copy()
+        self.title_font.configure(size=self.ui_font.cget("size") + 4, weight="bold")
+        if "Consolas" in families:
+            self.mono_font = tkfont.Font(family="Consolas", size=10)
+        else:
             self.mono_font = tkfont.nametofont("TkFixedFont")
 
         # 颜色系统：浅色背景 + 白色卡片
-        self._ui_bg = "#F5F7FB"
-        self._card_bg = "#FFFFFF"
-        self._border = "#E5E7EB"
-        self._text = "#111827"
-        self._muted = "#6B7280"
-        self._primary = "#2563EB"
-        self._primary_hover = "#1D4ED8"
-        self._primary_pressed = "#1E40AF"
+        self._ui_bg = _UI_BG
+        self._card_bg = _CARD_BG
+        self._border = _BORDER
+        self._text = _TEXT
+        self._muted = _MUTED
+        self._primary = _PRIMARY
+        self._primary_hover = _PRIMARY_HOVER
+        self._primary_pressed = _PRIMARY_PRESSED
 
         try:
             self.master.configure(background=self._ui_bg)
         except Exception:
             pass
 
-        # 全局控件基础样式
-        style.configure(".", font=self.ui_font)
-        style.configure("TFrame", background=self._ui_bg)
-        style.configure("Header.TFrame", background=self._ui_bg)
-        style.configure("TLabel", background=self._ui_bg, foreground=self._text, font=self.ui_font)
-        style.configure("TButton", font=self.ui_font, padding=(10, 6))
-        style.configure("TEntry", font=self.ui_font, padding=(8, 6))
-        # clam 下可用；其他主题会忽略，不影响功能
-        style.configure("TEntry", fieldbackground="#FFFFFF", foreground=self._text)
-        # Tab：明确区分选中/未选中/悬停，避免“看起来反了”
-        style.configure(
-            "TNotebook.Tab",
-            font=self.ui_font,
-            padding=(12, 7),
-            background="#E9EEF6",   # 未选中：浅灰蓝
-            foreground=self._muted, # 未选中：灰字
-            borderwidth=0,
-        )
-        style.map(
-            "TNotebook.Tab",
-            background=[
-                ("selected", self._card_bg),     # 选中：白底（与内容卡片一致）
-                ("active", "#DDE7FF"),           # 悬停：略深
-                ("!selected", "#E9EEF6"),
-            ],
-            foreground=[
-                ("selected", self._text),        # 选中：深色字
-                ("active", self._text),
-                ("!selected", self._muted),
-            ],
-        )
-
-        style.configure("Title.TLabel", font=self.title_font)
-        style.configure("SubTitle.TLabel", background=self._ui_bg, foreground=self._muted, font=self.ui_font)
-        style.configure("Status.TLabel", padding=(10, 6))
-
-        # Notebook 背景更“干净”
-        style.configure("TNotebook", background=self._ui_bg, borderwidth=0, tabmargins=(2, 2, 2, 0))
-
-        # 卡片（LabelFrame）风格：白底 + 细边框
-        style.configure(
-            "Card.TLabelframe",
-            background=self._card_bg,
-            borderwidth=1,
-            relief="solid",
-        )
-        style.configure(
-            "Card.TLabelframe.Label",
-            background=self._card_bg,
-            foreground=self._text,
-            font=self.ui_font_bold,
-        )
-        style.configure("Card.TFrame", background=self._card_bg)
-        style.configure("Card.TLabel", background=self._card_bg, foreground=self._text, font=self.ui_font)
-
-        # 主按钮：蓝色填充 + 悬停/按下态
-        style.configure(
-            "Primary.TButton",
-            font=self.ui_font_bold,
-            padding=(12, 7),
-            foreground="#FFFFFF",
-            background=self._primary,
-            borderwidth=0,
-            focusthickness=0,
-            focuscolor="none",
-        )
-        style.map(
-            "Primary.TButton",
-            background=[("pressed", self._primary_pressed), ("active", self._primary_hover)],
-            foreground=[("disabled", "#E5E7EB"), ("!disabled", "#FFFFFF")],
-        )
-
-        # 次按钮：卡片边框风格（用于“打开输出目录”等）
-        style.configure(
-            "Secondary.TButton",
-            padding=(10, 6),
-            foreground=self._text,
-            background=self._card_bg,
-            borderwidth=1,
-            relief="solid",
-        )
-        style.map(
-            "Secondary.TButton",
-            background=[("active", "#F3F4F6"), ("pressed", "#E5E7EB")],
-        )
+        # 按 _STYLE_SPEC 一次性下发样式；font 字段是字体属性名，这里替换成实际字体对象
+        for name, conf, state_map in _STYLE_SPEC:
+            if conf:
+                if "font" in conf:
+                    conf = {**conf, "font": getattr(self, conf["font"])}
+                style.configure(name, **conf)
+            if state_map:
+                style.map(name, **state_map)
 
     def set_status(self, text: str) -> None:
         if hasattr(self, "status_var"):
@@ -289,21 +792,19 @@ class GeoTiffToolApp:
             messagebox.showwarning("提示", "没有可打开的输出目录：请先选择/保存输出文件。")
             return
 
-        directory = os.path.abspath(directory)
-        if not os.path.isdir(directory):
-            try:
-                os.makedirs(directory, exist_ok=True)
-            except Exception as e:
-                messagebox.showerror("错误", f"无法创建目录：{directory}\n\n{e}")
-                return
+        directory = _abspath_cached(directory)
+        # 目录可能在上次打开后被删除：每次都 makedirs（已存在时什么也不做）
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except Exception as e:
+            messagebox.showerror("错误", f"无法创建目录：{directory}\n\n{e}")
+            return
 
         try:
             if sys.platform.startswith("win"):
                 os.startfile(directory)  # type: ignore[attr-defined]
-            elif sys.platform == "darwin":
-                subprocess.Popen(["open", directory])
             else:
-                subprocess.Popen(["xdg-open", directory])
+                _spawn_detached(_directory_opener() + [directory])
             self.set_status(f"已打开目录：{directory}")
         except Exception as e:
             messagebox.showerror("错误", f"打开目录失败：{directory}\n\n{e}")
@@ -340,7 +841,13 @@ class GeoTiffToolApp:
         # 操作按钮
         btn_row = ttk.Frame(frame)
         btn_row.grid(row=2, column=0, columnspan=3, sticky="e", pady=(10, 5))
-        ttk.Button(btn_row, text="重新提取/刷新预览", command=self.refresh_extract_preview).pack(side="left", padx=(0, 8))
+        # 紧凑 JSON：不缩进、无多余空格，文件更小、写得更快（仍可被本工具读回）
+        self.extract_compact_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(btn_row, text="紧凑 JSON（不缩进）", variable=self.extract_compact_var).pack(
+            side="left", padx=(0, 16)
+        )
+        self.extract_refresh_btn = ttk.Button(btn_row, text="重新提取/刷新预览", command=self.refresh_extract_preview)
+        self.extract_refresh_btn.pack(side="left", padx=(0, 8))
         ttk.Button(btn_row, text="打开输出目录", style="Secondary.TButton", command=self.open_extract_output_dir).pack(side="left", padx=(0, 8))
         ttk.Button(btn_row, text="保存地理信息", style="Primary.TButton", command=self.save_extracted_georef).pack(side="left")
 
@@ -380,10 +887,37 @@ class GeoTiffToolApp:
 
         preview_group.grid_rowconfigure(0, weight=1)
         preview_group.grid_columnconfigure(0, weight=1)
-        
+
+        # GCP 列表：GCP 可能有成千上万个，只在滚动到底部附近时才继续插入行
+        gcp_group = ttk.LabelFrame(frame, text="GCP 列表", padding="8 8 8 8", style="Card.TLabelframe")
+        gcp_group.grid(row=4, column=0, columnspan=3, sticky="nsew", pady=(10, 0))
+
+        self.extract_gcp_tree = ttk.Treeview(gcp_group, columns=_GCP_TREE_COLUMNS, show="headings", height=8)
+        for col, title, width in zip(
+            _GCP_TREE_COLUMNS,
+            ("#", "pixel", "line", "x", "y", "z", "id"),
+            (50, 100, 100, 140, 140, 90, 90),
+        ):
+            self.extract_gcp_tree.heading(col, text=title)
+            self.extract_gcp_tree.column(col, width=width, anchor="e" if col != "id" else "w", stretch=col in ("x", "y"))
+        gcp_scroll = ttk.Scrollbar(gcp_group, orient="vertical", command=self.extract_gcp_tree.yview)
+
+        def _on_gcp_tree_scroll(first, last) -> None:
+            gcp_scroll.set(first, last)
+            if float(last) > 0.9 and self._gcp_tree_filled < len(self._gcp_tree_cols[0]):
+                self._fill_gcp_tree()
+
+        self.extract_gcp_tree.configure(yscrollcommand=_on_gcp_tree_scroll)
+        self.extract_gcp_tree.grid(row=0, column=0, sticky="nsew")
+        gcp_scroll.grid(row=0, column=1, sticky="ns")
+
+        gcp_group.grid_rowconfigure(0, weight=1)
+        gcp_group.grid_columnconfigure(0, weight=1)
+
         # 确保列可以扩展
         frame.grid_columnconfigure(1, weight=1)
         frame.grid_rowconfigure(3, weight=1)
+        frame.grid_rowconfigure(4, weight=1)
 
     def open_extract_output_dir(self) -> None:
         out_dir = self._output_dir_from_path(
@@ -419,6 +953,8 @@ class GeoTiffToolApp:
             messagebox.showerror("错误", "请先选择一个 GeoTIFF 文件。")
             return
 
+        # 用户显式要求重新提取：丢弃缓存，强制重新读取文件
+        _read_georef_cached.cache_clear()
         self._extract_and_show(input_file)
 
     def save_extracted_georef(self):
@@ -438,7 +974,7 @@ class GeoTiffToolApp:
             self.extract_output_path.insert(0, output_file)
 
         try:
-            self._write_georef_json(self._extract_data, output_file)
+            self._write_georef_json(self._extract_data, output_file, pretty=not self.extract_compact_var.get())
             messagebox.showinfo("成功", "地理信息已保存！\n请查看输出文件。")
             self.set_status(f"已保存地理信息：{output_file}")
         except Exception as e:
@@ -448,6 +984,7 @@ class GeoTiffToolApp:
     def _extract_and_show(self, input_file: str) -> None:
         # 清空旧数据/预览
         self._extract_data = None
+        self._set_gcp_tree(None)
         self._set_extract_preview_text("正在读取地理信息，请稍候...")
         self.set_status("正在读取 GeoTIFF 地理信息...")
 
@@ -455,38 +992,89 @@ class GeoTiffToolApp:
             self._set_extract_preview_text("无法导入 osgeo.gdal；请使用安装了 GDAL 的虚拟环境运行。")
             return
 
+        self._extract_seq += 1
+        seq = self._extract_seq
+        self.extract_refresh_btn.state(["disabled"])
+        fut = self._extract_pool.submit(self._extract_georef_data, input_file)
+        fut.add_done_callback(lambda f: self._post_to_ui(self._on_extract_done, f, input_file, seq))
+
+    def _post_to_ui(self, func, *args) -> None:
+        # 从后台线程切回 Tk 主循环；窗口已关闭时 after() 会抛 TclError，结果直接丢弃
+        try:
+            self.master.after(0, func, *args)
+        except (tk.TclError, RuntimeError):
+            pass
+
+    def _on_close(self) -> None:
+        # 提取线程不是守护线程：关闭窗口时取消排队的提取任务，也不在界面线程里等正在进行的那一个
+        self._extract_pool.shutdown(wait=False, cancel_futures=True)
+        self.master.destroy()
+
+    def _on_extract_done(self, fut: Future, input_file: str, seq: int) -> None:
+        # 期间用户又选了别的文件：这个结果已经过时
+        if seq != self._extract_seq:
+            return
+        self.extract_refresh_btn.state(["!disabled"])
+
         try:
-            data = self._extract_georef_data(input_file)
-            self._extract_data = data
-            self._set_extract_preview_text(self._format_georef_preview(data))
-            self.set_status(f"已读取：{os.path.basename(input_file)}")
+            data = fut.result()
         except Exception as e:
             self._set_extract_preview_text(f"提取失败：{e}")
             messagebox.showerror("错误", f"坐标信息提取失败！\n\n{e}")
             self.set_status("读取失败")
+            return
+
+        self._extract_data = data
+        self._set_extract_preview_text(self._format_georef_preview(data, list_gcps=False))
+        self._set_gcp_tree(_gcp_columns(data))
+        self.set_status(f"已读取：{os.path.basename(input_file)}")
 
     def _set_extract_preview_text(self, text: str) -> None:
         if not hasattr(self, "extract_preview_text"):
             return
-        self.extract_preview_text.configure(state="normal")
-        self.extract_preview_text.delete("1.0", tk.END)
-        self.extract_preview_text.insert("1.0", text)
-        self.extract_preview_text.configure(state="disabled")
+        self._set_text_widget(self.extract_preview_text, text)
 
-    def _format_georef_preview(self, data: dict) -> str:
+    def _set_gcp_tree(self, gcp_cols: list | None) -> None:
+        if not hasattr(self, "extract_gcp_tree"):
+            return
+        tree = self.extract_gcp_tree
+        tree.delete(*tree.get_children())
+        tree.yview_moveto(0)
+        self._gcp_tree_cols = gcp_cols or [[] for _ in _GCP_KEYS]
+        self._gcp_tree_filled = 0
+        self._fill_gcp_tree()
+
+    def _fill_gcp_tree(self) -> None:
+        tree = self.extract_gcp_tree
+        cols = self._gcp_tree_cols
+        start = self._gcp_tree_filled
+        end = min(start + _GCP_TREE_BATCH, len(cols[0]))
+        rows = zip(*(c[start:end] for c in cols))
+        for i, (id_, _info, pixel, line, x, y, z) in enumerate(rows, start=start + 1):
+            tree.insert("", "end", values=(i, pixel, line, x, y, z, id_))
+        self._gcp_tree_filled = end
+
+    def _format_georef_preview(self, data: Mapping, list_gcps: bool = True) -> str:
         proj = data.get("projection_wkt") or ""
         gcp_proj = data.get("gcp_projection_wkt") or ""
         gt = data.get("geotransform")
         raster_size = data.get("raster_size")
-        gcps = data.get("gcps") or []
+        gcp_error = ""
+        try:
+            gcp_cols = _gcp_columns(data)
+        except ValueError as e:
+            gcp_cols, gcp_error = None, str(e)
+        gcp_count = len(gcp_cols[0]) if gcp_cols else 0
 
         def _short_wkt(wkt: str, max_len: int = 800) -> str:
-            wkt = (wkt or "").strip()
-            if not wkt:
+            # 只处理开头 max_len 个字符，避免对超长 WKT2 做整串 strip/拷贝
+            m = _NON_SPACE_RE.search(wkt or "")
+            if m is None:
                 return "(空)"
-            if len(wkt) <= max_len:
-                return wkt
-            return wkt[:max_len] + "\n...（已截断）"
+            head = wkt[m.start() : m.start() + max_len + 1]
+            if len(head) <= max_len:
+                return head.rstrip()
+            return head[:max_len] + "\n...（已截断）"
 
         lines = []
         lines.append(f"来源文件：{data.get('source_file', '')}")
@@ -494,23 +1082,31 @@ class GeoTiffToolApp:
             lines.append(f"栅格大小：{raster_size[0]} x {raster_size[1]}")
         lines.append("")
         lines.append("GeoTransform：")
-        lines.append(json.dumps(gt, ensure_ascii=False) if gt is not None else "(空)")
+        lines.append(_fmt_gt(gt) if gt is not None else "(空)")
         lines.append("")
         lines.append("Projection WKT：")
         lines.append(_short_wkt(proj))
         lines.append("")
-        lines.append(f"GCP 数量：{len(gcps)}")
-        if gcps:
-            lines.append("前 5 个 GCP：")
-            for i, g in enumerate(gcps[:5], start=1):
-                lines.append(
-                    f"{i}. pixel/line=({g.get('pixel')}, {g.get('line')}) -> x/y/z=({g.get('x')}, {g.get('y')}, {g.get('z')}) id={g.get('id')}"
-                )
+        if gcp_count and not list_gcps:
+            lines.append(f"GCP 数量：{gcp_count}（明细见下方 GCP 列表）")
+        else:
+            lines.append(f"GCP 数量：{gcp_count}")
+        if gcp_error:
+            lines.append(gcp_error)
+        if gcp_count:
+            if list_gcps:
+                lines.append("前 5 个 GCP：")
+                for i, (id_, _info, pixel, line, x, y, z) in enumerate(zip(*(c[:5] for c in gcp_cols)), start=1):
+                    lines.append(f"{i}. pixel/line=({pixel}, {line}) -> x/y/z=({x}, {y}, {z}) id={id_}")
             lines.append("")
             lines.append("GCP Projection WKT：")
             lines.append(_short_wkt(gcp_proj))
 
-        return "\n".join(lines)
+        buf = "\n".join(lines)
+        # 预览只是给人看的：限制总长度，避免超大文本拖慢 Text 控件
+        if len(buf) > _PREVIEW_MAX_CHARS:
+            buf = buf[:_PREVIEW_MAX_CHARS] + "\n...（已截断）"
+        return buf
 
     # --- Tab 2 布局和逻辑：坐标嵌入 ---
     def create_embed_tab(self, tab):
@@ -539,9 +1135,17 @@ class GeoTiffToolApp:
         # 操作按钮
         btn_row = ttk.Frame(frame)
         btn_row.grid(row=3, column=0, columnspan=3, sticky="e", pady=(10, 5))
+        # 大文件可以只写 .aux.xml 旁车文件，省去整份 TIFF 的复制
+        self.embed_pam_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            btn_row, text="只写 .aux.xml 旁车文件（不复制 TIFF）", variable=self.embed_pam_var
+        ).pack(side="left", padx=(0, 16))
         ttk.Button(btn_row, text="刷新预览", command=self.refresh_embed_preview).pack(side="left", padx=(0, 8))
         ttk.Button(btn_row, text="打开输出目录", style="Secondary.TButton", command=self.open_embed_output_dir).pack(side="left", padx=(0, 8))
-        ttk.Button(btn_row, text="应用并保存 GeoTIFF", style="Primary.TButton", command=self.apply_embed_and_save).pack(side="left")
+        self.embed_batch_btn = ttk.Button(btn_row, text="批量应用...", style="Secondary.TButton", command=self.apply_embed_batch)
+        self.embed_batch_btn.pack(side="left", padx=(0, 8))
+        self.embed_apply_btn = ttk.Button(btn_row, text="应用并保存 GeoTIFF", style="Primary.TButton", command=self.apply_embed_and_save)
+        self.embed_apply_btn.pack(side="left")
 
         # 预览区域：左=坐标文件，右=目标 TIFF 当前信息（可拖拽分栏）
         preview_group = ttk.LabelFrame(frame, text="嵌入预览", padding="8 8 8 8", style="Card.TLabelframe")
@@ -680,13 +1284,14 @@ class GeoTiffToolApp:
             if not self._ensure_gdal_available():
                 return
 
-            # 确保坐标文件已解析
-            if self._embed_georef_data is None:
+            # 确保坐标文件已解析（文件未变化时直接复用上次的解析结果）
+            if self._embed_georef_data is None or self._embed_georef_cache_key != _file_cache_key(georef_file):
                 self._load_georef_file_and_preview(georef_file)
             if self._embed_georef_data is None:
                 return
 
-            if not output_file or not output_file.strip():
+            use_pam = bool(self.embed_pam_var.get())
+            if not use_pam and (not output_file or not output_file.strip()):
                 output_file = filedialog.asksaveasfilename(
                     defaultextension=".tif",
                     filetypes=[("GeoTIFF files", "*.tif;*.tiff")],
@@ -696,21 +1301,78 @@ class GeoTiffToolApp:
                 self.embed_output_path.delete(0, tk.END)
                 self.embed_output_path.insert(0, output_file)
 
-            self._apply_georef_from_json(georef_file, edited_file, output_file)
-            messagebox.showinfo("成功", "坐标信息嵌入任务成功完成！\n请查看输出文件。")
-            self.set_status(f"已输出 GeoTIFF：{output_file}")
+            # 上面已确认 _embed_georef_data 与当前坐标文件一致：直接交给写入，不再重复读取/解析
+            written = self._apply_georef_from_json(
+                georef_file, edited_file, output_file, use_pam=use_pam, data=self._embed_georef_data
+            )
+            if use_pam:
+                # TIFF 本身没变（缓存键不变），旁车文件却变了：丢弃已缓存的读取结果
+                _read_georef_cached.cache_clear()
+                messagebox.showinfo("成功", f"坐标信息已写入旁车文件：\n{written}")
+                self.set_status(f"已输出旁车文件：{written}")
+            else:
+                messagebox.showinfo("成功", "坐标信息嵌入任务成功完成！\n请查看输出文件。")
+                self.set_status(f"已输出 GeoTIFF：{written}")
         except Exception as e:
             messagebox.showerror("错误", f"坐标信息嵌入任务失败！\n\n{e}")
             self.set_status("写入失败")
 
+    def apply_embed_batch(self):
+        # 同一份坐标文件写入多个编辑后的 TIFF；输出名与单文件时相同（文件名后加 _georef）
+        georef_file = self.embed_georef_path.get().strip()
+        if not georef_file:
+            messagebox.showerror("错误", "请先选择坐标文件。")
+            return
+        if not self._ensure_gdal_available():
+            return
+
+        files = filedialog.askopenfilenames(filetypes=[("TIFF files", "*.tif;*.tiff")])
+        if not files:
+            return
+
+        use_pam = bool(self.embed_pam_var.get())
+        jobs = []
+        for f in files:
+            base, ext = os.path.splitext(f)
+            jobs.append((georef_file, f, base + "_georef" + (ext or ".tif")))
+
+        self.set_status(f"正在批量写入 {len(jobs)} 个文件...")
+        # 批量任务结束前禁止再次写入：否则两个进程池会同时复制/更新同一批输出文件
+        for btn in (self.embed_batch_btn, self.embed_apply_btn):
+            btn.state(["disabled"])
+
+        def _worker() -> None:
+            try:
+                results = self._apply_batch(jobs, use_pam=use_pam)
+            except Exception as e:
+                results = [(job, None, e) for job in jobs]
+            self.master.after(0, self._on_embed_batch_done, results)
+
+        threading.Thread(target=_worker, daemon=True).start()
+
+    def _on_embed_batch_done(self, results: list) -> None:
+        for btn in (self.embed_batch_btn, self.embed_apply_btn):
+            btn.state(["!disabled"])
+        # 旁车文件模式下 TIFF 本身不变：丢弃已缓存的读取结果
+        _read_georef_cached.cache_clear()
+        failed = [(job, e) for job, _, e in results if e is not None]
+        ok = len(results) - len(failed)
+        if failed:
+            detail = "\n".join(f"{os.path.basename(job[1])}：{e}" for job, e in failed[:10])
+            messagebox.showerror("批量写入", f"成功 {ok} 个，失败 {len(failed)} 个：\n\n{detail}")
+        else:
+            messagebox.showinfo("批量写入", f"全部完成，共 {ok} 个文件。")
+        self.set_status(f"批量写入完成：成功 {ok}，失败 {len(failed)}")
+
     def _set_text_widget(self, widget: tk.Text, text: str) -> None:
         widget.configure(state="normal")
-        widget.delete("1.0", tk.END)
-        widget.insert("1.0", text)
+        # 一次 replace 代替 delete + insert 两次 B-tree 更新
+        widget.replace("1.0", tk.END, text)
         widget.configure(state="disabled")
 
     def _load_georef_file_and_preview(self, georef_file: str) -> None:
         self._embed_georef_data = None
+        self._embed_georef_cache_key = None
         if not hasattr(self, "embed_georef_preview"):
             return
 
@@ -719,11 +1381,12 @@ class GeoTiffToolApp:
             return
 
         try:
-            with open(georef_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            if data.get("format") != "geomosaic_georef_v1":
+            with open(georef_file, "rb") as f:
+                data = _json_loads(f.read())
+            if data.get("format") not in _GEOREF_FORMATS:
                 raise ValueError("坐标文件格式不受支持：请使用本工具导出的 JSON。")
             self._embed_georef_data = data
+            self._embed_georef_cache_key = _file_cache_key(georef_file)
             self._set_text_widget(self.embed_georef_preview, self._format_georef_preview(data))
         except Exception as e:
             self._set_text_widget(self.embed_georef_preview, f"读取坐标文件失败：{e}")
@@ -749,7 +1412,7 @@ class GeoTiffToolApp:
             self._set_text_widget(self.embed_target_preview, f"读取目标 TIFF 失败：{e}")
 
     def _ensure_gdal_available(self) -> bool:
-        if gdal is not None:
+        if _import_gdal():
             return True
         messagebox.showerror(
             "错误",
@@ -759,122 +1422,85 @@ class GeoTiffToolApp:
         )
         return False
 
-    def _extract_georef_data(self, input_file: str) -> dict:
+    def _extract_georef_data(self, input_file: str) -> Mapping:
         if not os.path.isfile(input_file):
             raise FileNotFoundError(f"输入文件不存在：{input_file}")
 
-        ds = gdal.Open(input_file, gdal.GA_ReadOnly)
-        if ds is None:
-            raise RuntimeError("无法打开输入 GeoTIFF（GDAL.Open 返回 None）。")
-
-        try:
-            gt = None
-            try:
-                gt = ds.GetGeoTransform(can_return_null=True)
-            except TypeError:
-                # 兼容旧版 GDAL：没有 can_return_null 参数
-                gt = ds.GetGeoTransform()
-
-            projection_wkt = ds.GetProjection() or ""
-            gcp_projection_wkt = ds.GetGCPProjection() or ""
-            gcps = ds.GetGCPs() or []
-
-            data = {
-                "format": "geomosaic_georef_v1",
-                "source_file": os.path.basename(input_file),
-                "raster_size": [ds.RasterXSize, ds.RasterYSize],
-                "geotransform": list(gt) if gt else None,
-                "projection_wkt": projection_wkt,
-                "gcp_projection_wkt": gcp_projection_wkt,
-                "gcps": [
-                    {
-                        "id": gcp.Id,
-                        "info": gcp.Info,
-                        "pixel": gcp.GCPPixel,
-                        "line": gcp.GCPLine,
-                        "x": gcp.GCPX,
-                        "y": gcp.GCPY,
-                        "z": gcp.GCPZ,
-                    }
-                    for gcp in gcps
-                ],
-                "metadata": ds.GetMetadata() or {},
-            }
-        finally:
-            ds = None
-
-        return data
-
-    def _write_georef_json(self, data: dict, output_file: str) -> None:
-        out_dir = os.path.dirname(output_file)
-        if out_dir and not os.path.isdir(out_dir):
-            os.makedirs(out_dir, exist_ok=True)
-
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
-    def _apply_georef_from_json(self, georef_file: str, edited_file: str, output_file: str) -> None:
-        if not os.path.isfile(georef_file):
-            raise FileNotFoundError(f"坐标文件不存在：{georef_file}")
-        if not os.path.isfile(edited_file):
-            raise FileNotFoundError(f"编辑后的 TIFF 不存在：{edited_file}")
-
-        with open(georef_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        if data.get("format") != "geomosaic_georef_v1":
-            raise ValueError("坐标文件格式不受支持：请使用本工具导出的 TXT/GEO 文件。")
+        # 同一文件（路径 + 修改时间 + 大小都相同）直接复用上次读取的结果
+        st = os.stat(input_file)
+        return _read_georef_cached(os.path.abspath(input_file), st.st_mtime_ns, st.st_size)
 
+    def _write_georef_json(
+        self, data: Mapping, output_file: str, pretty: bool = False, durable: bool = False
+    ) -> None:
         out_dir = os.path.dirname(output_file)
-        if out_dir and not os.path.isdir(out_dir):
+        if out_dir:
             os.makedirs(out_dir, exist_ok=True)
 
-        # 先复制一份，再在副本上写入地理参考信息，避免破坏原始编辑文件
-        shutil.copy2(edited_file, output_file)
-
-        ds = gdal.Open(output_file, gdal.GA_Update)
-        if ds is None:
-            raise RuntimeError("无法以更新模式打开输出 TIFF（GDAL.Open 返回 None）。")
+        # 先在内存里编码成完整的 UTF-8 字节串，再一次写入（json.dump 会逐个片段地写）
+        # pretty=False 时输出紧凑格式（机器读回用）；给人看的导出再缩进
+        if orjson is not None:
+            payload = orjson.dumps(dict(data), option=orjson.OPT_INDENT_2 if pretty else None)
+        else:
+            # 纯 ASCII 时 ensure_ascii=True 输出完全相同，且走 C 编码器的 ASCII 快速路径、编码成字节也更快
+            ensure_ascii = _all_ascii(data)
+            if pretty:
+                text = json.dumps(dict(data), ensure_ascii=ensure_ascii, indent=2)
+            else:
+                text = json.dumps(dict(data), ensure_ascii=ensure_ascii, separators=(",", ":"))
+            payload = text.encode("ascii" if ensure_ascii else "utf-8")
 
+        # 整块字节直接 os.write，不经过文件对象的缓冲层；durable=True 时再 fsync 落盘
+        # O_BINARY：Windows 上避免换行被转换成 CRLF
+        fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
         try:
-            gt = data.get("geotransform")
-            if gt:
-                ds.SetGeoTransform(tuple(gt))
-
-            proj = data.get("projection_wkt") or ""
-            if proj:
-                ds.SetProjection(proj)
-
-            gcps_data = data.get("gcps") or []
-            gcp_proj = data.get("gcp_projection_wkt") or ""
-            if gcps_data:
-                gcp_list = []
-                for g in gcps_data:
-                    gcp_list.append(
-                        gdal.GCP(
-                            float(g.get("x", 0.0)),
-                            float(g.get("y", 0.0)),
-                            float(g.get("z", 0.0)),
-                            float(g.get("pixel", 0.0)),
-                            float(g.get("line", 0.0)),
-                            str(g.get("id", "")),
-                            str(g.get("info", "")),
-                        )
-                    )
-                ds.SetGCPs(gcp_list, gcp_proj)
-
-            # 元数据按需写回（可选）；默认不覆盖，避免写入不期望的内容
-            # meta = data.get("metadata") or {}
-            # if meta:
-            #     ds.SetMetadata(meta)
-
-            ds.FlushCache()
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+            if durable:
+                os.fsync(fd)
         finally:
-            ds = None
+            os.close(fd)
+
+    def _apply_georef_from_json(
+        self,
+        georef_file: str,
+        edited_file: str,
+        output_file: str,
+        use_pam: bool = False,
+        data: Mapping | None = None,
+    ) -> str:
+        return _apply_georef_from_json_standalone(georef_file, edited_file, output_file, use_pam, data)
+
+    def _apply_batch(
+        self, jobs: list[tuple[str, str, str]], max_workers: int | None = None, use_pam: bool = False
+    ) -> list[tuple[tuple[str, str, str], str | None, Exception | None]]:
+        """多进程并行执行多个 (georef_file, edited_file, output_file) 写入任务。
+
+        返回 [(job, 写出的路径或 None, 异常或 None)]，顺序按完成先后。
+        """
+        results = []
+        if not jobs:
+            return results
+        # 进程数不超过任务数（每个子进程都要重新导入模块和 GDAL）；
+        # Windows 上 ProcessPoolExecutor 最多 61 个进程，显式传入更大的值会抛 ValueError
+        workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+        if sys.platform.startswith("win"):
+            workers = min(workers, _MAX_WINDOWS_WORKERS)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futs = {pool.submit(_apply_georef_from_json_standalone, *job, use_pam): job for job in jobs}
+            for fut in as_completed(futs):
+                try:
+                    results.append((futs[fut], fut.result(), None))
+                except Exception as e:
+                    results.append((futs[fut], None, e))
+        return results
 
 
 # --- 运行主程序 ---
 if __name__ == "__main__":
+    # 批量写入使用进程池；PyInstaller 打包后子进程需要这一步
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = GeoTiffToolApp(root)
     root.mainloop()